@@ -0,0 +1,73 @@
+"""
+Login throughput benchmark
+Drives POST /api/auth/login in-process and reports logins/sec overall and per hashing core
+
+Run from backend/:
+    python -m benchmarks.login_throughput --requests 200 --concurrency 16
+    SCRYPT_N=32768 PASSWORD_HASH_WORKERS=2 python -m benchmarks.login_throughput
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from routers.auth import router as auth_router
+from utils.security import password_hasher
+
+EMAIL = "bench@example.com"
+PASSWORD = "correct horse battery staple"
+
+
+async def run(requests: int, concurrency: int) -> None:
+    app = FastAPI()
+    app.include_router(auth_router, prefix="/api")
+    transport = httpx.ASGITransport(app=app)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post("/api/auth/register", json={"name": "Bench", "email": EMAIL, "password": PASSWORD})
+        if response.status_code not in (200, 400):
+            raise SystemExit(f"Register failed: {response.status_code} {response.text}")
+
+        async def login() -> None:
+            async with semaphore:
+                response = await client.post("/api/auth/login", json={"email": EMAIL, "password": PASSWORD})
+                response.raise_for_status()
+
+        # Warm the hashing pool before timing
+        await asyncio.gather(*(login() for _ in range(min(concurrency, requests))))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    password_hasher.shutdown()
+    cores = min(password_hasher.max_workers, os.cpu_count() or 1)
+    throughput = requests / elapsed
+    if password_hasher.algorithm == "scrypt":
+        cost = f"n={password_hasher.scrypt_n} r={password_hasher.scrypt_r} p={password_hasher.scrypt_p}"
+    else:
+        cost = f"iterations={password_hasher.pbkdf2_iterations}"
+    print(f"algorithm:    {password_hasher.algorithm} ({cost})")
+    print(f"workers:      {password_hasher.max_workers} (cores used: {cores})")
+    print(f"requests:     {requests} @ concurrency {concurrency}")
+    print(f"elapsed:      {elapsed:.2f}s")
+    print(f"throughput:   {throughput:.1f} logins/s")
+    print(f"per core:     {throughput / cores:.1f} logins/s")
+    print(f"mean latency: {elapsed / requests * concurrency * 1000:.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="Timed login requests")
+    parser.add_argument("--concurrency", type=int, default=16, help="Logins in flight at once")
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Preference scoring benchmark
+Builds a synthetic movies catalog and times matching + weighted top-K sampling per request
+
+Run from backend/:
+    python -m benchmarks.preference_scoring --items 1000000
+"""
+
+import argparse
+import random
+import time
+
+from utils.catalog import DATASET_SCHEMAS, ColumnarCatalog
+from utils.preference_scoring import get_preference_index
+
+GENRES = ["sci-fi", "romantic", "drama", "comedy", "thriller", "horror", "adventure", "tech", "lifestyle"]
+WORDS = ["space", "love", "war", "city", "night", "music", "travel", "ai", "dream", "ocean", "star", "heart"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=1_000_000, help="Catalog size")
+    parser.add_argument("--requests", type=int, default=50, help="Timed scoring requests")
+    args = parser.parse_args()
+
+    rnd = random.Random(0)
+    records = [
+        {"title": " ".join(rnd.sample(WORDS, 3)).title(), "genre": rnd.choice(GENRES), "rating": 5.0, "year": 2000}
+        for _ in range(args.items)
+    ]
+
+    start = time.perf_counter()
+    catalog = ColumnarCatalog.from_records(records, DATASET_SCHEMAS["movies"])
+    index = get_preference_index(catalog, ["space", "love"])
+    print(f"build:   {time.perf_counter() - start:.2f}s for {args.items:,} items")
+
+    start = time.perf_counter()
+    for _ in range(args.requests):
+        picked = index.sample(index.compile(["romantic", "sci-fi"], ["space", "love"]), 5)
+    elapsed = (time.perf_counter() - start) / args.requests
+    print(f"request (broad prefs):  {elapsed * 1000:.2f} ms, picked {picked.tolist()}")
+
+    start = time.perf_counter()
+    for _ in range(args.requests):
+        picked = index.sample(index.compile(["horror"], ["ocean star"]), 5)
+    elapsed = (time.perf_counter() - start) / args.requests
+    print(f"request (narrow prefs): {elapsed * 1000:.2f} ms, picked {picked.tolist()}")
+
+
+if __name__ == "__main__":
+    main()
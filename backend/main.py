@@ -1,3 +1,6 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse
@@ -5,13 +8,38 @@ from routers.recommendations import router as recommendations_router
 from routers.contact import router as contact_router
 from routers.auth import router as auth_router
 from routers.tmdb import router as tmdb_router
+from utils.http_client import http_clients
+from utils.security import password_hasher
+from utils.ai_summary import summarizer, WARM_UP_SUMMARY_MODEL
+from utils.cache import tmdb_cache, TMDB_CACHE_SWEEP_INTERVAL, TMDB_CACHE_WARM_ENTRIES
 from dotenv import load_dotenv
 import os
 
 load_dotenv()
 APP_NAME = os.getenv("APP_NAME", "AI RecoSys Backend")
 
-app = FastAPI(title=APP_NAME, version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Open pooled upstream clients once per worker and close them on shutdown
+    await http_clients.startup()
+    await asyncio.to_thread(password_hasher.warm_up)
+    await asyncio.to_thread(tmdb_cache.warm_from_store, TMDB_CACHE_WARM_ENTRIES)
+    tmdb_cache.start_sweeper(TMDB_CACHE_SWEEP_INTERVAL)
+    if WARM_UP_SUMMARY_MODEL:
+        # Load the local summary model off the event loop; startup doesn't wait for it,
+        # summarizer.aclose() does
+        summarizer.start_warm_up()
+    yield
+    await tmdb_cache.stop_sweeper()
+    tmdb_cache.close_store()
+    await http_clients.shutdown()
+    password_hasher.shutdown()
+    await summarizer.aclose()
+    summarizer.shutdown()
+
+
+app = FastAPI(title=APP_NAME, version="1.0.0", lifespan=lifespan)
 
 # Allow all origins in development
 # In production, replace with your actual frontend URL
@@ -1,9 +1,9 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, EmailStr
 from typing import Optional
-from data.database import USERS
-from utils.security import hash_password, verify_password
-from utils.jwt_handler import create_access_token
+from utils.security import password_hasher
+from utils.jwt_handler import create_access_token, token_cache
+from utils.user_store import EmailAlreadyRegistered, user_store
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -17,23 +17,32 @@ class LoginPayload(BaseModel):
     password: str
 
 @router.post("/register")
-def register(payload: RegisterPayload):
-    # simple uniqueness by email
-    if any(u["email"].lower() == payload.email.lower() for u in USERS):
+async def register(payload: RegisterPayload):
+    # Reject taken emails before spending a KDF run on the hashing pool
+    if user_store.get_by_email(payload.email):
         raise HTTPException(status_code=400, detail="Email already registered")
-    next_id = max([u["id"] for u in USERS] or [0]) + 1
-    USERS.append({
-        "id": next_id,
-        "name": payload.name,
-        "email": payload.email,
-        "password": hash_password(payload.password),
-    })
-    return {"id": next_id, "name": payload.name, "email": payload.email}
+    password_hash = await password_hasher.hash_async(payload.password)
+    # uniqueness by case-folded email is still enforced by the store, for concurrent registrations
+    try:
+        user = user_store.create(payload.name, payload.email, password_hash)
+    except EmailAlreadyRegistered:
+        raise HTTPException(status_code=400, detail="Email already registered")
+    return {"id": user["id"], "name": user["name"], "email": user["email"]}
 
 @router.post("/login")
-def login(payload: LoginPayload):
-    user = next((u for u in USERS if u["email"].lower() == payload.email.lower()), None)
-    if not user or not verify_password(payload.password, user.get("password", "")):
+async def login(payload: LoginPayload):
+    user = user_store.get_by_email(payload.email)
+    # Unknown emails cost the same KDF run as a wrong password
+    stored_hash = user.get("password") if user else None
+    if not await password_hasher.verify_or_dummy_async(payload.password, stored_hash):
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    # Upgrade legacy sha256 (or outdated-cost) hashes now that we know the password
+    if password_hasher.needs_rehash(user["password"]):
+        user_store.update_password(user["email"], await password_hasher.hash_async(payload.password))
     token = create_access_token(sub=str(user["id"]))
     return {"access_token": token, "token_type": "bearer"}
+
+@router.get("/token-stats")
+def token_stats():
+    # Hit rate of the verified-token cache used by require_token
+    return {"token_cache": token_cache.get_stats()}
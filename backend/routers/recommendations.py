@@ -1,70 +1,62 @@
+import asyncio
+import json
 import logging
-from fastapi import APIRouter, HTTPException
-from typing import List, Dict, Any, Union
-from data.database import RECOMMENDATIONS
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from typing import List, Dict, Any, Optional, Union
 from utils.jwt_handler import require_token
 from utils.recommendation_engine import get_recommendations
-from data import recommendations as rec
+from utils.http_client import get_client
+from utils.search_index import CatalogIndex, normalize_query
+from utils.query_pipeline import ParsedQuery, parse_query, query_memo
+from utils.cache import CachePolicy, tmdb_cache
+from utils.catalog import get_catalog
+from utils.trending import trending_service, TRENDING_MAX_LIMIT
+from utils.ai_summary import summarizer
 from pydantic import BaseModel
-import httpx
+import numpy as np
 import os
 from dotenv import load_dotenv
+from datetime import timedelta
 
 # Load environment variables
 load_dotenv()
 TMDB_API_KEY = os.getenv("TMDB_API_KEY")
 
 # Constants
-TMDB_BASE_URL = "https://api.themoviedb.org/3"
 TMDB_IMAGE_BASE_URL = "https://image.tmdb.org/t/p/w500"
 MAX_RESULTS = 10
 REQUEST_TIMEOUT = 30.0
-
-# Filler words to remove from queries (excluding genre terms)
-FILLER_WORDS = {
-    'show', 'me', 'some', 'recommend', 'movies', 'movie', 'films', 'film', 'want', 'like', 'suggest',
-    'please', 'can', 'you', 'find', 'get', 'give', 'tell', 'about', 'a', 'an', 'the', 'good', 'best',
-    'top', 'great', 'awesome', 'amazing', 'wonderful', 'fantastic', 'excellent', 'perfect', 'nice',
-    'cool', 'interesting', 'fun', 'exciting', 'thrilling', 'action', 'packed', 'full', 'of', 'with',
-    'that', 'are', 'is', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does',
-    'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'shall', 'let', 'lets',
-    'let\'s', 'i', 'we', 'they', 'he', 'she', 'it', 'this', 'that', 'these', 'those', 'my', 'your',
-    'his', 'her', 'its', 'our', 'their', 'what', 'which', 'who', 'when', 'where', 'why', 'how',
-    'all', 'any', 'both', 'each', 'few', 'many', 'most', 'other', 'some', 'such', 'no', 'nor',
-    'not', 'only', 'own', 'same', 'so', 'than', 'too', 'very', 'just', 'also', 'even', 'ever',
-    'never', 'here', 'there', 'now', 'then', 'once', 'always', 'sometimes', 'often', 'usually',
-    'rarely', 'seldom', 'again', 'still', 'yet', 'already', 'soon', 'later', 'before', 'after',
-    'since', 'until', 'while', 'during', 'through', 'across', 'against', 'among', 'between',
-    'into', 'onto', 'upon', 'under', 'over', 'above', 'below', 'behind', 'beside', 'near', 'by',
-    'from', 'to', 'at', 'in', 'on', 'for', 'as', 'with', 'about', 'like', 'through', 'during',
-    'before', 'after', 'above', 'below', 'between', 'among', 'inside', 'outside', 'beside',
-    'behind', 'beyond', 'near', 'far', 'close', 'open', 'full', 'empty', 'hot', 'cold', 'wet',
-    'dry', 'big', 'small', 'large', 'little', 'long', 'short', 'high', 'low', 'wide', 'narrow',
-    'thick', 'thin', 'heavy', 'light', 'hard', 'soft', 'fast', 'slow', 'easy', 'difficult',
-    'simple', 'complex', 'new', 'old', 'young', 'fresh', 'clean', 'dirty', 'right', 'wrong',
-    'true', 'false', 'real', 'fake', 'good', 'bad', 'better', 'best', 'worse', 'worst', 'more',
-    'most', 'less', 'least', 'first', 'last', 'next', 'previous', 'early', 'late', 'soon',
-    'later', 'now', 'then', 'here', 'there', 'everywhere', 'nowhere', 'anywhere', 'somewhere',
-    'every', 'all', 'both', 'neither', 'either', 'none', 'any', 'some', 'many', 'much', 'few',
-    'little', 'several', 'enough', 'plenty', 'lot', 'lots', 'bit', 'piece', 'part', 'whole',
-    'half', 'quarter', 'third', 'everything', 'nothing', 'anything', 'something', 'everyone',
-    'noone', 'anyone', 'someone', 'everybody', 'nobody', 'anybody', 'somebody', 'everything',
-    'nothing', 'anything', 'something', 'everywhere', 'nowhere', 'anywhere', 'somewhere'
-}
-
-# Genre terms to preserve (not remove as filler)
-GENRE_TERMS = {
-    'sci-fi', 'science', 'fiction', 'horror', 'thriller', 'comedy', 'drama', 'action', 'adventure',
-    'romance', 'mystery', 'fantasy', 'animation', 'documentary', 'biography', 'crime', 'western',
-    'musical', 'war', 'history', 'family', 'sport', 'music', 'reality', 'talk', 'news', 'game'
-}
-
-# Content type keywords
-CONTENT_TYPE_KEYWORDS = {
-    "books": ["book", "books", "read", "reading", "novel", "author", "literature"],
-    "products": ["product", "products", "buy", "shop", "gadget", "item", "purchase"],
-    "blogs": ["blog", "blogs", "article", "post", "tech", "lifestyle", "news"]
-}
+# Overall budget for POST /recommendations; sources still running after it are left to finish in the background
+RECOMMENDATIONS_DEADLINE = float(os.getenv("RECOMMENDATIONS_DEADLINE_MS", 300)) / 1000
+
+# Full responses of POST /recommendations, keyed by content type and normalized query.
+# Movie queries TMDB had nothing for are kept briefly so they don't hit TMDB on every repeat.
+RECOMMENDATIONS_POLICY = CachePolicy(
+    namespace="recommendations",
+    key=lambda content_type, query: f"{content_type}:{query}",
+    ttl=timedelta(minutes=10),
+    hard_ttl=timedelta(minutes=30),
+    max_entries=500,
+    negative_ttl=timedelta(minutes=2),
+    is_negative=lambda response: response.get("tmdb_miss", False),
+    # A response cut short by the deadline is served once but never stored;
+    # the next call picks up the TMDB results cached under TMDB_SEARCH_POLICY
+    is_cacheable=lambda response: not response.get("partial", False),
+)
+tmdb_cache.set_namespace_limit(RECOMMENDATIONS_POLICY.namespace, RECOMMENDATIONS_POLICY.max_entries)
+
+# TMDB search results on their own, so a search that outlives the deadline is still cached for the next call
+TMDB_SEARCH_POLICY = CachePolicy(
+    namespace="recommendations_tmdb",
+    key=lambda search_term: search_term,
+    ttl=timedelta(minutes=10),
+    hard_ttl=timedelta(minutes=30),
+    max_entries=500,
+    negative_ttl=timedelta(minutes=2),
+    is_negative=lambda results: not results,
+)
+tmdb_cache.set_namespace_limit(TMDB_SEARCH_POLICY.namespace, TMDB_SEARCH_POLICY.max_entries)
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -76,38 +68,6 @@ class QueryPayload(BaseModel):
     query: str
 
 
-def normalize_query(query: str) -> str:
-    """Normalize query by lowercasing, replacing hyphens/underscores with spaces, and collapsing whitespace."""
-    if not query:
-        return ""
-    normalized = query.lower().replace("-", " ").replace("_", " ")
-    return " ".join(normalized.split())
-
-
-def detect_content_type(normalized_query: str) -> str:
-    """Detect content type from normalized query."""
-    # Check for specific content type keywords
-    for content_type, keywords in CONTENT_TYPE_KEYWORDS.items():
-        if any(keyword in normalized_query for keyword in keywords):
-            return content_type
-
-    # Check for genre terms that might indicate books/movies
-    if any(genre in normalized_query for genre in ['thriller', 'mystery', 'romance', 'fantasy', 'biography']):
-        return "books"  # Default to books for these genres
-
-    return "movies"  # default
-
-
-def remove_filler_words(query: str) -> str:
-    """Remove filler words from query, preserving genre terms and content type keywords."""
-    words = query.lower().split()
-    filtered_words = [
-        word for word in words
-        if (word not in FILLER_WORDS or word in GENRE_TERMS) and len(word) > 1
-    ]
-    return " ".join(filtered_words) if filtered_words else ""
-
-
 async def search_tmdb(search_term: str) -> List[Dict[str, Any]]:
     """Search TMDB API for movies."""
     if not TMDB_API_KEY:
@@ -115,162 +75,133 @@ async def search_tmdb(search_term: str) -> List[Dict[str, Any]]:
         return []
 
     try:
-        async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT) as client:
-            response = await client.get(
-                f"{TMDB_BASE_URL}/search/movie",
-                params={
-                    "api_key": TMDB_API_KEY,
-                    "query": search_term,
-                    "include_adult": False,
-                    "page": 1
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
-
-            results = []
-            for movie in data.get("results", [])[:MAX_RESULTS]:
-                results.append({
-                    "id": movie.get("id"),
-                    "title": movie.get("title", ""),
-                    "genre": "",  # TMDB search doesn't provide genres
-                    "description": movie.get("overview", "No description available"),
-                    "image": f"{TMDB_IMAGE_BASE_URL}{movie.get('poster_path')}" if movie.get("poster_path") else None,
-                    "rating": round(movie.get("vote_average", 0), 1),
-                    "year": movie.get("release_date", "")[:4] if movie.get("release_date") else "",
-                    "type": "movie"
-                })
-            logger.info(f"TMDB search successful: {len(results)} results for '{search_term}'")
-            return results
+        client = get_client("tmdb")
+        response = await client.get(
+            "/search/movie",
+            params={
+                "api_key": TMDB_API_KEY,
+                "query": search_term,
+                "include_adult": False,
+                "page": 1
+            },
+            timeout=REQUEST_TIMEOUT
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        results = []
+        for movie in data.get("results", [])[:MAX_RESULTS]:
+            results.append({
+                "id": movie.get("id"),
+                "title": movie.get("title", ""),
+                "genre": "",  # TMDB search doesn't provide genres
+                "description": movie.get("overview", "No description available"),
+                "image": f"{TMDB_IMAGE_BASE_URL}{movie.get('poster_path')}" if movie.get("poster_path") else None,
+                "rating": round(movie.get("vote_average", 0), 1),
+                "year": movie.get("release_date", "")[:4] if movie.get("release_date") else "",
+                "type": "movie"
+            })
+        logger.info(f"TMDB search successful: {len(results)} results for '{search_term}'")
+        return results
 
     except Exception as e:
         logger.error(f"TMDB search failed for '{search_term}': {str(e)}")
         return []
 
 
+def _movie_row(i: int) -> Dict[str, Any]:
+    movies = get_catalog("movies")
+    title, genre = movies.get("title", i) or "", movies.get("genre", i) or ""
+    return {
+        "id": i + 1,
+        "title": title,
+        "genre": genre,
+        "description": f"{title} is a highly rated {genre} movie.",
+        "image": f"https://placehold.co/400x600?text={title.replace(' ', '+')}",
+        "rating": movies.get("rating", i) or 0,
+        "year": movies.get("year", i) or "",
+        "type": "movie"
+    }
+
+
+def _book_row(i: int) -> Dict[str, Any]:
+    books = get_catalog("books")
+    title, genre, author = books.get("title", i) or "", books.get("genre", i) or "", books.get("author", i) or ""
+    return {
+        "id": 1000 + i + 1,
+        "title": title,
+        "genre": genre,
+        "description": f"Book by {author}: {title} ({genre}).",
+        "image": f"https://placehold.co/400x600?text={title.replace(' ', '+')}",
+        "rating": books.get("rating", i) or 0,
+        "author": author,
+        "type": "book"
+    }
+
+
+def _product_row(i: int) -> Dict[str, Any]:
+    products = get_catalog("products")
+    name, category = products.get("name", i) or "", products.get("category", i) or ""
+    return {
+        "id": 2000 + i + 1,
+        "title": name,
+        "genre": category,
+        "description": f"Product: {name} ({category}).",
+        "image": f"https://placehold.co/400x600?text={name.replace(' ', '+')}",
+        "price": products.get("price", i) or 0,
+        "type": "product"
+    }
+
+
+def _blog_row(i: int) -> Dict[str, Any]:
+    blogs = get_catalog("blogs")
+    title, topic = blogs.get("title", i) or "", blogs.get("topic", i) or ""
+    return {
+        "id": 3000 + i + 1,
+        "title": title,
+        "genre": topic,
+        "description": f"Blog post: {title} ({topic}).",
+        "image": f"https://placehold.co/400x600?text={title.replace(' ', '+')}",
+        "tags": blogs.get("tags", i) or [],
+        "type": "blog"
+    }
+
+
+def build_static_catalogs() -> Dict[str, CatalogIndex]:
+    """Index the searchable fields of every columnar catalog once; rows are formatted on demand."""
+    def fields(name: str, *columns: str):
+        catalog = get_catalog(name)
+        return list(zip(*(catalog.strings_of(column) for column in columns)))
+
+    return {
+        "movies": CatalogIndex(_movie_row, fields("movies", "title", "genre")),
+        "books": CatalogIndex(_book_row, fields("books", "title", "genre", "author")),
+        "products": CatalogIndex(_product_row, fields("products", "name", "category")),
+        "blogs": CatalogIndex(_blog_row, fields("blogs", "title", "topic")),
+    }
+
+
+# Built once at import; call build_static_catalogs() again if the datasets change
+STATIC_CATALOGS = build_static_catalogs()
+
+
 def search_static(content_type: str, query: str) -> List[Dict[str, Any]]:
     """Search static data for given content type."""
     normalized_query = normalize_query(query)
-    results = []
+    catalog = STATIC_CATALOGS.get(content_type)
+    if catalog is None:
+        return []
 
-    if content_type == "movies":
-        for i, movie in enumerate(rec.movies):
-            title = movie.get("title", "")
-            genre = movie.get("genre", "")
-            title_norm = normalize_query(title)
-            genre_norm = normalize_query(genre)
-
-            should_include = (
-                not normalized_query or
-                normalized_query in title_norm or
-                normalized_query in genre_norm
-            )
-
-            if should_include:
-                results.append({
-                    "id": i + 1,
-                    "title": title,
-                    "genre": genre,
-                    "description": f"{title} is a highly rated {genre} movie.",
-                    "image": f"https://placehold.co/400x600?text={title.replace(' ', '+')}",
-                    "rating": movie.get("rating", 0),
-                    "year": movie.get("year", ""),
-                    "type": "movie"
-                })
-
-    elif content_type == "books":
-        # If query is content-type specific or empty, return all books
-        if not normalized_query or normalized_query.lower() in ["books", "book"]:
-            for i, book in enumerate(rec.books):
-                title = book.get("title", "")
-                genre = book.get("genre", "")
-                author = book.get("author", "")
-                results.append({
-                    "id": 1000 + i + 1,
-                    "title": title,
-                    "genre": genre,
-                    "description": f"Book by {author}: {title} ({genre}).",
-                    "image": f"https://placehold.co/400x600?text={title.replace(' ', '+')}",
-                    "rating": book.get("rating", 0),
-                    "author": author,
-                    "type": "book"
-                })
+    if content_type == "books":
+        # If query is content-type specific or empty, return all books;
+        # otherwise match any query word against title, genre or author
+        if not normalized_query or normalized_query in ["books", "book"]:
+            results = catalog.all()
         else:
-            for i, book in enumerate(rec.books):
-                title = book.get("title", "")
-                genre = book.get("genre", "")
-                author = book.get("author", "")
-                title_norm = normalize_query(title)
-                genre_norm = normalize_query(genre)
-                author_norm = normalize_query(author)
-
-                should_include = (
-                    any(word in title_norm for word in normalized_query.split()) or
-                    any(word in genre_norm for word in normalized_query.split()) or
-                    any(word in author_norm for word in normalized_query.split())
-                )
-
-                if should_include:
-                    results.append({
-                        "id": 1000 + i + 1,
-                        "title": title,
-                        "genre": genre,
-                        "description": f"Book by {author}: {title} ({genre}).",
-                        "image": f"https://placehold.co/400x600?text={title.replace(' ', '+')}",
-                        "rating": book.get("rating", 0),
-                        "author": author,
-                        "type": "book"
-                    })
-
-    elif content_type == "products":
-        for i, product in enumerate(rec.products):
-            name = product.get("name", "")
-            category = product.get("category", "")
-            name_norm = normalize_query(name)
-            category_norm = normalize_query(category)
-
-            # For products, if no specific query, return all; otherwise filter
-            should_include = (
-                not normalized_query or
-                normalized_query in name_norm or
-                normalized_query in category_norm
-            )
-
-            if should_include:
-                results.append({
-                    "id": 2000 + i + 1,
-                    "title": name,
-                    "genre": category,
-                    "description": f"Product: {name} ({category}).",
-                    "image": f"https://placehold.co/400x600?text={name.replace(' ', '+')}",
-                    "price": product.get("price", 0),
-                    "type": "product"
-                })
-
-    elif content_type == "blogs":
-        for i, blog in enumerate(rec.blogs):
-            title = blog.get("title", "")
-            topic = blog.get("topic", "")
-            title_norm = normalize_query(title)
-            topic_norm = normalize_query(topic)
-
-            # For blogs, if no specific query, return all; otherwise filter
-            should_include = (
-                not normalized_query or
-                normalized_query in title_norm or
-                normalized_query in topic_norm
-            )
-
-            if should_include:
-                results.append({
-                    "id": 3000 + i + 1,
-                    "title": title,
-                    "genre": topic,
-                    "description": f"Blog post: {title} ({topic}).",
-                    "image": f"https://placehold.co/400x600?text={title.replace(' ', '+')}",
-                    "tags": blog.get("tags", []),
-                    "type": "blog"
-                })
+            results = catalog.search_any_word(normalized_query)
+    else:
+        # Whole query must appear in a single field; empty query returns all
+        results = catalog.search_phrase(normalized_query)
 
     logger.info(f"Static search for {content_type}: {len(results)} results for '{query}'")
     return results
@@ -278,79 +209,196 @@ def search_static(content_type: str, query: str) -> List[Dict[str, Any]]:
 
 @router.get("/")
 def get_all() -> List[Dict[str, Any]]:
-    return RECOMMENDATIONS
+    return get_catalog("recommendations").rows()
 
 
 @router.get("/by-id/{item_id}")
 def get_by_id(item_id: int) -> Dict[str, Any]:
-    for item in RECOMMENDATIONS:
-        if item["id"] == item_id:
-            return item
+    catalog = get_catalog("recommendations")
+    matches = np.flatnonzero(np.asarray(catalog.column("id")) == item_id)
+    if len(matches):
+        return catalog.row(int(matches[0]))
     raise HTTPException(status_code=404, detail="Recommendation not found")
 
 
-@router.post("/")
-async def search_recommendations(payload: Union[QueryPayload, str]) -> Dict[str, Any]:
-    """
-    Accepts a free-form query and returns a list of normalized recommendation items
-    expected by the frontend RecommendationResults component.
-    """
-    # Support both {"query": "..."} and raw string body
-    raw_query = payload if isinstance(payload, str) else getattr(payload, "query", "")
-    logger.info(f"Processing recommendation query: '{raw_query}'")
+async def _cached_tmdb_search(search_term: str) -> List[Dict[str, Any]]:
+    results, _ = await tmdb_cache.get_or_fetch(
+        TMDB_SEARCH_POLICY.build_key(search_term=search_term),
+        lambda: search_tmdb(search_term),
+        ttl=TMDB_SEARCH_POLICY.ttl,
+        hard_ttl=TMDB_SEARCH_POLICY.hard_ttl,
+        negative_ttl=TMDB_SEARCH_POLICY.negative_ttl,
+        is_negative=TMDB_SEARCH_POLICY.is_negative,
+    )
+    return results
 
-    normalized_query = normalize_query(raw_query)
-    content_type = detect_content_type(normalized_query)
-    logger.info(f"Detected content type: {content_type}")
 
+def _merge_results(*sources: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Concatenate result lists in priority order, dropping repeated titles."""
+    seen = set()
+    merged: List[Dict[str, Any]] = []
+    for results in sources:
+        for item in results:
+            title = str(item.get("title", "")).strip().casefold()
+            if title in seen:
+                continue
+            seen.add(title)
+            merged.append(item)
+    return merged
+
+
+async def _search_uncached(parsed: ParsedQuery) -> Dict[str, Any]:
+    """
+    Run a parsed query against TMDB / static data.
+
+    Movie queries fan out to TMDB and the static index at once and wait at
+    most RECOMMENDATIONS_DEADLINE; whatever arrived is merged, TMDB first.
+    tmdb_miss marks a query TMDB had nothing for, partial one where TMDB
+    missed the deadline.
+    """
+    raw_query = parsed.raw
+    content_type = parsed.content_type
     results: List[Dict[str, Any]] = []
+    tmdb_miss = False
+    partial = False
 
     if content_type == "movies":
-        # Try TMDB first
-        search_term = remove_filler_words(raw_query)
-        logger.info(f"Searching TMDB with term: '{search_term}'")
-        results = await search_tmdb(search_term)
-
-        # Fallback to static data if TMDB failed or returned no results
-        if not results:
-            logger.info("TMDB search failed or returned no results, falling back to static data")
-            effective_search = search_term if search_term else raw_query
-            results = search_static("movies", effective_search)
+        search_term = parsed.search_term
+        logger.info(f"Searching TMDB and static data with term: '{search_term}'")
+        tmdb_task = asyncio.create_task(_cached_tmdb_search(search_term))
+        static_task = asyncio.create_task(
+            asyncio.to_thread(search_static, "movies", search_term if search_term else raw_query)
+        )
+        done, _ = await asyncio.wait({tmdb_task, static_task}, timeout=RECOMMENDATIONS_DEADLINE)
+
+        tmdb_results: List[Dict[str, Any]] = []
+        if tmdb_task in done:
+            tmdb_results = tmdb_task.result()
+            tmdb_miss = not tmdb_results
+        else:
+            # The shared fetch behind the cache keeps running and stores its result
+            logger.info(f"TMDB missed the {RECOMMENDATIONS_DEADLINE * 1000:.0f} ms deadline, returning partial results")
+            tmdb_task.cancel()
+            partial = True
+
+        static_results: List[Dict[str, Any]] = []
+        if static_task in done:
+            static_results = static_task.result()
+        else:
+            static_task.cancel()
+            partial = True
+
+        results = _merge_results(tmdb_results, static_results)
     else:
         # For non-movie content types, use static data
         # Remove filler words to get meaningful search terms
-        cleaned_query = remove_filler_words(raw_query)
+        cleaned_query = parsed.search_term
         if not cleaned_query:
             # If only filler words remain, return all items
             results = search_static(content_type, "")
         else:
             results = search_static(content_type, cleaned_query)
 
-    logger.info(f"Returning {len(results)} results for content type '{content_type}'")
-    return {"results": results}
+    return {"results": results, "tmdb_miss": tmdb_miss, "partial": partial}
+
+
+async def _recommend(raw_query: str) -> List[Dict[str, Any]]:
+    """Recommendation items for a free-form query, through the response cache"""
+    logger.info(f"Processing recommendation query: '{raw_query}'")
+
+    parsed = parse_query(raw_query)
+    content_type = parsed.content_type
+    logger.info(f"Detected content type: {content_type}")
+
+    # Identical queries share one cached response (and one in-flight search)
+    key = RECOMMENDATIONS_POLICY.build_key(content_type=content_type, query=" ".join(parsed.tokens))
+    response, from_cache = await tmdb_cache.get_or_fetch(
+        key,
+        lambda: _search_uncached(parsed),
+        ttl=RECOMMENDATIONS_POLICY.ttl,
+        hard_ttl=RECOMMENDATIONS_POLICY.hard_ttl,
+        negative_ttl=RECOMMENDATIONS_POLICY.negative_ttl,
+        is_negative=RECOMMENDATIONS_POLICY.is_negative,
+        is_cacheable=RECOMMENDATIONS_POLICY.is_cacheable,
+    )
+    results = response["results"]
+
+    logger.info(f"Returning {len(results)} {'cached ' if from_cache else ''}results for content type '{content_type}'")
+    return results
+
+
+@router.post("/")
+async def search_recommendations(payload: Union[QueryPayload, str]) -> Dict[str, Any]:
+    """
+    Accepts a free-form query and returns a list of normalized recommendation items
+    expected by the frontend RecommendationResults component.
+    """
+    # Support both {"query": "..."} and raw string body
+    raw_query = payload if isinstance(payload, str) else getattr(payload, "query", "")
+    return {"results": await _recommend(raw_query)}
+
+
+@router.get("/summary")
+async def summary(query: str = Query(..., min_length=1)) -> Dict[str, str]:
+    """
+    AI summary of a query's recommendations, generated without blocking the
+    worker and cached. Results come from the same cache as POST /.
+    """
+    results = await _recommend(query)
+    return {"summary": await summarizer.generate_summary_async(query, results)}
+
+
+@router.get("/summary/stream")
+async def stream_summary(query: str = Query(..., min_length=1)) -> StreamingResponse:
+    """
+    Server-sent events with the AI summary of a query's recommendations.
+    Each "data:" event carries {"text": <chunk>} as it is generated; a final
+    "done" event marks the end, or an "error" event if generation failed
+    partway. Results come from the same cache as POST /.
+    """
+    results = await _recommend(query)
+
+    async def events():
+        try:
+            async for chunk in summarizer.stream_summary(query, results):
+                yield f"data: {json.dumps({'text': chunk})}\n\n"
+        except Exception:
+            # Already logged by the summarizer; the text sent so far is incomplete
+            yield f"event: error\ndata: {json.dumps({'detail': 'Summary generation failed'})}\n\n"
+            return
+        yield "event: done\ndata: {}\n\n"
+
+    # Ask proxies not to buffer, so chunks reach the browser as they are produced
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/secure")
-def secure_list(_: dict = require_token) -> List[Dict[str, Any]]:
+def secure_list(_: dict = Depends(require_token)) -> List[Dict[str, Any]]:
     # Returns the same as public list, but requires a valid token
-    return RECOMMENDATIONS
+    return get_catalog("recommendations").rows()
 
 
 @router.get("/trending")
-def trending() -> List[Dict[str, Any]]:
-    # simple top by rating across categories where available
-    all_items: List[Dict[str, Any]] = []
-    for m in rec.movies:
-        all_items.append({"type": "movie", **m})
-    for b in rec.books:
-        all_items.append({"type": "book", **b})
-    # blogs/products may not have rating; give them baseline
-    for bl in rec.blogs:
-        all_items.append({"type": "blog", **bl, "rating": 3.5})
-    for p in rec.products:
-        all_items.append({"type": "product", **p, "rating": 4.0})
-    all_items.sort(key=lambda x: x.get("rating", 0), reverse=True)
-    return all_items[:10]
+def trending(
+    limit: int = Query(10, ge=1, le=TRENDING_MAX_LIMIT),
+    item_type: Optional[str] = Query(None, alias="type", description="movie, book, blog or product")
+) -> List[Dict[str, Any]]:
+    # top by rating from precomputed rankings; blogs/products use a baseline rating
+    kind = item_type.lower().rstrip("s") if item_type else None
+    try:
+        return trending_service.top(limit=limit, kind=kind)
+    except KeyError:
+        raise HTTPException(status_code=400, detail="Unsupported type")
+
+
+@router.get("/query-stats")
+def query_stats() -> Dict[str, Any]:
+    # Hit rate of the memoized query understanding (content type, genre, search terms)
+    return {"query_memo": query_memo.get_stats()}
 
 
 @router.get("/{category}")
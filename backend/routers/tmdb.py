@@ -4,7 +4,9 @@ import os
 from dotenv import load_dotenv
 import httpx
 from pydantic import BaseModel
-from utils.cache import tmdb_cache
+from datetime import timedelta
+from utils.cache import tmdb_cache, cached, CachePolicy
+from utils.http_client import get_client
 import logging
 
 # Configure logging
@@ -19,6 +21,33 @@ TMDB_API_KEY = os.getenv("TMDB_API_KEY")
 TMDB_BASE_URL = "https://api.themoviedb.org/3"
 TMDB_IMAGE_BASE_URL = "https://image.tmdb.org/t/p/w500"
 
+# Per-route cache policies (key builder, soft/hard TTL, max entries)
+TRENDING_POLICY = CachePolicy(
+    namespace="trending",
+    key=lambda: "weekly",
+    ttl=timedelta(minutes=10),
+)
+SEARCH_POLICY = CachePolicy(
+    namespace="search",
+    key=lambda q: q.lower(),
+    ttl=timedelta(minutes=10),
+    max_entries=300,
+)
+MOVIE_DETAILS_POLICY = CachePolicy(
+    namespace="movie",
+    key=lambda movie_id: str(movie_id),
+    ttl=timedelta(hours=24),
+    hard_ttl=timedelta(days=7),
+    max_entries=500,
+)
+POPULAR_POLICY = CachePolicy(
+    namespace="popular",
+    key=lambda page: f"page:{page}",
+    ttl=timedelta(minutes=30),
+    hard_ttl=timedelta(hours=6),
+    max_entries=100,
+)
+
 # Log API key status on startup (without exposing the actual key)
 if TMDB_API_KEY:
     if TMDB_API_KEY == "your_tmdb_api_key_here":
@@ -88,13 +117,14 @@ def format_movie_detail(movie: Dict[str, Any]) -> Dict[str, Any]:
 
 
 @router.get("/trending")
+@cached(tmdb_cache, TRENDING_POLICY)
 async def get_trending_movies() -> Dict[str, Any]:
     """
     Get trending movies from TMDB (weekly).
     Returns a list of trending movies with basic information.
     Cached for 10 minutes.
     """
-    logger.info("📡 Trending movies endpoint called")
+    logger.info("📡 Fetching trending movies")
 
     # Check API key
     if not TMDB_API_KEY or TMDB_API_KEY == "your_tmdb_api_key_here":
@@ -109,15 +139,8 @@ async def get_trending_movies() -> Dict[str, Any]:
             }
         )
 
-    # Check cache first
-    cache_key = "trending:weekly"
-    cached_data = tmdb_cache.get(cache_key)
-    if cached_data is not None:
-        logger.info("✅ Returning cached trending movies")
-        return {**cached_data, "cached": True}
-
     # Build request URL
-    url = f"{TMDB_BASE_URL}/trending/movie/week"
+    url = "/trending/movie/week"
     params = {"api_key": TMDB_API_KEY}
 
     # Log request (without exposing API key)
@@ -125,31 +148,24 @@ async def get_trending_movies() -> Dict[str, Any]:
     logger.info(f"📝 Request params: api_key=***{TMDB_API_KEY[-4:] if len(TMDB_API_KEY) > 4 else '****'}")
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url, params=params)
+        client = get_client("tmdb")
+        response = await client.get(url, params=params)
 
-            # Log response status
-            logger.info(f"📊 TMDB Response Status: {response.status_code}")
+        # Log response status
+        logger.info(f"📊 TMDB Response Status: {response.status_code}")
 
-            response.raise_for_status()
-            data = response.json()
+        response.raise_for_status()
+        data = response.json()
 
-            logger.info(f"✅ Successfully fetched {len(data.get('results', []))} trending movies")
+        logger.info(f"✅ Successfully fetched {len(data.get('results', []))} trending movies")
 
-            movies = [format_movie(movie) for movie in data.get("results", [])]
-
-            result = {
-                "results": movies,
-                "total_results": len(movies),
-                "page": data.get("page", 1),
-                "cached": False
-            }
+        movies = [format_movie(movie) for movie in data.get("results", [])]
 
-            # Cache the result
-            tmdb_cache.set(cache_key, result)
-            logger.info(f"💾 Cached trending movies with key: {cache_key}")
-
-            return result
+        return {
+            "results": movies,
+            "total_results": len(movies),
+            "page": data.get("page", 1)
+        }
 
     except httpx.HTTPStatusError as e:
         logger.error(f"❌ TMDB API HTTP Error: {e.response.status_code} - {e.response.text}")
@@ -177,13 +193,14 @@ async def get_trending_movies() -> Dict[str, Any]:
 
 
 @router.get("/search")
+@cached(tmdb_cache, SEARCH_POLICY)
 async def search_movies(q: str = Query(..., min_length=1, description="Search query")) -> Dict[str, Any]:
     """
     Search for movies on TMDB.
     Returns a list of movies matching the search query.
     Cached for 10 minutes per unique query.
     """
-    logger.info(f"🔍 Search endpoint called with query: '{q}'")
+    logger.info(f"🔍 Searching movies for query: '{q}'")
 
     # Check API key
     if not TMDB_API_KEY or TMDB_API_KEY == "your_tmdb_api_key_here":
@@ -198,15 +215,8 @@ async def search_movies(q: str = Query(..., min_length=1, description="Search qu
             }
         )
 
-    # Check cache first
-    cache_key = f"search:{q.lower()}"
-    cached_data = tmdb_cache.get(cache_key)
-    if cached_data is not None:
-        logger.info(f"✅ Returning cached search results for: '{q}'")
-        return {**cached_data, "cached": True}
-
     # Build request URL
-    url = f"{TMDB_BASE_URL}/search/movie"
+    url = "/search/movie"
     params = {
         "api_key": TMDB_API_KEY,
         "query": q,
@@ -218,32 +228,25 @@ async def search_movies(q: str = Query(..., min_length=1, description="Search qu
     logger.info(f"📝 Search query: '{q}', include_adult: False")
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url, params=params)
-
-            # Log response status
-            logger.info(f"📊 TMDB Response Status: {response.status_code}")
+        client = get_client("tmdb")
+        response = await client.get(url, params=params)
 
-            response.raise_for_status()
-            data = response.json()
+        # Log response status
+        logger.info(f"📊 TMDB Response Status: {response.status_code}")
 
-            logger.info(f"✅ Found {data.get('total_results', 0)} total results for '{q}' (showing {len(data.get('results', []))})")
+        response.raise_for_status()
+        data = response.json()
 
-            movies = [format_movie(movie) for movie in data.get("results", [])]
-
-            result = {
-                "results": movies,
-                "total_results": data.get("total_results", 0),
-                "page": data.get("page", 1),
-                "query": q,
-                "cached": False
-            }
+        logger.info(f"✅ Found {data.get('total_results', 0)} total results for '{q}' (showing {len(data.get('results', []))})")
 
-            # Cache the result
-            tmdb_cache.set(cache_key, result)
-            logger.info(f"💾 Cached search results with key: {cache_key}")
+        movies = [format_movie(movie) for movie in data.get("results", [])]
 
-            return result
+        return {
+            "results": movies,
+            "total_results": data.get("total_results", 0),
+            "page": data.get("page", 1),
+            "query": q
+        }
 
     except httpx.HTTPStatusError as e:
         logger.error(f"❌ TMDB API HTTP Error: {e.response.status_code} - {e.response.text}")
@@ -271,12 +274,14 @@ async def search_movies(q: str = Query(..., min_length=1, description="Search qu
 
 
 @router.get("/movie/{movie_id}")
+@cached(tmdb_cache, MOVIE_DETAILS_POLICY)
 async def get_movie_details(movie_id: int) -> Dict[str, Any]:
     """
     Get detailed information about a specific movie.
     Returns full movie details including genres, runtime, budget, etc.
+    Cached for 24 hours per movie.
     """
-    logger.info(f"🎬 Movie details endpoint called for ID: {movie_id}")
+    logger.info(f"🎬 Fetching movie details for ID: {movie_id}")
 
     # Check API key
     if not TMDB_API_KEY or TMDB_API_KEY == "your_tmdb_api_key_here":
@@ -291,23 +296,23 @@ async def get_movie_details(movie_id: int) -> Dict[str, Any]:
         )
 
     # Build request URL
-    url = f"{TMDB_BASE_URL}/movie/{movie_id}"
+    url = f"/movie/{movie_id}"
     params = {"api_key": TMDB_API_KEY}
 
     logger.info(f"🌐 Fetching movie details from TMDB: {url}")
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url, params=params)
+        client = get_client("tmdb")
+        response = await client.get(url, params=params)
 
-            logger.info(f"📊 TMDB Response Status: {response.status_code}")
+        logger.info(f"📊 TMDB Response Status: {response.status_code}")
 
-            response.raise_for_status()
-            movie = response.json()
+        response.raise_for_status()
+        movie = response.json()
 
-            logger.info(f"✅ Successfully fetched details for: {movie.get('title', 'Unknown')}")
+        logger.info(f"✅ Successfully fetched details for: {movie.get('title', 'Unknown')}")
 
-            return format_movie_detail(movie)
+        return format_movie_detail(movie)
 
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 404:
@@ -338,10 +343,12 @@ async def get_movie_details(movie_id: int) -> Dict[str, Any]:
 
 
 @router.get("/popular")
+@cached(tmdb_cache, POPULAR_POLICY)
 async def get_popular_movies(page: int = Query(1, ge=1, le=500)) -> Dict[str, Any]:
     """
     Get popular movies from TMDB.
     Returns a list of currently popular movies.
+    Cached for 30 minutes per page.
     """
     if not TMDB_API_KEY or TMDB_API_KEY == "your_tmdb_api_key_here":
         raise HTTPException(
@@ -350,25 +357,27 @@ async def get_popular_movies(page: int = Query(1, ge=1, le=500)) -> Dict[str, An
         )
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{TMDB_BASE_URL}/movie/popular",
-                params={
-                    "api_key": TMDB_API_KEY,
-                    "page": page
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
+        client = get_client("tmdb")
+        response = await client.get(
+            "/movie/popular",
+            params={
+                "api_key": TMDB_API_KEY,
+                "page": page
+            },
+            # Keep the 5s budget this endpoint had before the shared client (whose default is TMDB_TIMEOUT)
+            timeout=5.0
+        )
+        response.raise_for_status()
+        data = response.json()
 
-            movies = [format_movie(movie) for movie in data.get("results", [])]
+        movies = [format_movie(movie) for movie in data.get("results", [])]
 
-            return {
-                "results": movies,
-                "total_results": data.get("total_results", 0),
-                "page": data.get("page", 1),
-                "total_pages": data.get("total_pages", 1)
-            }
+        return {
+            "results": movies,
+            "total_results": data.get("total_results", 0),
+            "page": data.get("page", 1),
+            "total_pages": data.get("total_pages", 1)
+        }
     except httpx.HTTPStatusError as e:
         raise HTTPException(status_code=e.response.status_code, detail=f"TMDB API error: {str(e)}")
     except Exception as e:
@@ -404,22 +413,23 @@ async def tmdb_health_check() -> Dict[str, Any]:
 
     # Test API key by making a simple request
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                f"{TMDB_BASE_URL}/configuration",
-                params={"api_key": TMDB_API_KEY}
-            )
-            response.raise_for_status()
+        client = get_client("tmdb")
+        response = await client.get(
+            "/configuration",
+            params={"api_key": TMDB_API_KEY},
+            timeout=10.0
+        )
+        response.raise_for_status()
 
-            logger.info("✅ TMDB API key is valid and working")
-            return {
-                "status": "ok",
-                "api_key_configured": True,
-                "api_key_valid": True,
-                "api_key_length": len(TMDB_API_KEY),
-                "message": "TMDB API is configured correctly and responding",
-                "base_url": TMDB_BASE_URL
-            }
+        logger.info("✅ TMDB API key is valid and working")
+        return {
+            "status": "ok",
+            "api_key_configured": True,
+            "api_key_valid": True,
+            "api_key_length": len(TMDB_API_KEY),
+            "message": "TMDB API is configured correctly and responding",
+            "base_url": TMDB_BASE_URL
+        }
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 401:
             logger.error("❌ TMDB API key is invalid (401 Unauthorized)")
@@ -455,10 +465,12 @@ async def get_cache_stats() -> Dict[str, Any]:
     Returns information about cached entries.
     """
     stats = tmdb_cache.get_stats()
+    hard_ttl = tmdb_cache.default_hard_ttl or tmdb_cache.default_ttl
     return {
         "cache_stats": stats,
         "ttl_minutes": 10,
-        "message": "Cache automatically expires after 10 minutes"
+        "hard_ttl_minutes": int(hard_ttl.total_seconds() // 60),
+        "message": "Entries are refreshed in the background after 10 minutes and served stale until the hard TTL"
     }
 
 
@@ -0,0 +1,148 @@
+"""
+Tests for utils.batching.MicroBatcher
+Run from backend/: python -m pytest tests
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from utils.batching import MicroBatcher
+
+
+def _double(items):
+    return [item * 2 for item in items]
+
+
+def test_batches_split_at_max_batch_size():
+    sizes = []
+
+    def batch_fn(items):
+        sizes.append(len(items))
+        return _double(items)
+
+    # A long window, so only max_batch_size can close a batch early
+    batcher = MicroBatcher(batch_fn, max_batch_size=4, max_wait=0.5)
+    futures = [batcher.submit(i) for i in range(10)]
+    assert [f.result(timeout=5) for f in futures] == [i * 2 for i in range(10)]
+    assert sizes == [4, 4, 2]
+    assert batcher.get_stats()["batches"] == 3
+    batcher.shutdown()
+
+
+def test_result_count_mismatch_fails_every_future():
+    batcher = MicroBatcher(lambda items: items[:-1], max_batch_size=3, max_wait=0.5)
+    futures = [batcher.submit(i) for i in range(3)]
+    for future in futures:
+        with pytest.raises(RuntimeError, match="returned 2 results for 3 items"):
+            future.result(timeout=5)
+    batcher.shutdown()
+
+
+def test_batch_fn_error_reaches_every_future():
+    def batch_fn(items):
+        raise ValueError("model failed")
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=2, max_wait=0.5)
+    futures = [batcher.submit(i) for i in range(2)]
+    for future in futures:
+        with pytest.raises(ValueError, match="model failed"):
+            future.result(timeout=5)
+    batcher.shutdown()
+
+
+def test_restarts_after_shutdown():
+    batcher = MicroBatcher(_double, max_batch_size=2, max_wait=0.01)
+    assert batcher.submit(1).result(timeout=5) == 2
+    batcher.shutdown()
+    assert batcher._thread is None
+
+    assert batcher.submit(2).result(timeout=5) == 4
+    assert batcher._thread is not None and batcher._thread.is_alive()
+    batcher.shutdown()
+
+
+def test_concurrent_submit_and_shutdown():
+    name = "race-batcher"
+    batcher = MicroBatcher(_double, max_batch_size=4, max_wait=0.001, name=name)
+    futures = []
+    done = threading.Event()
+
+    def submitter(offset):
+        for i in range(200):
+            futures.append((offset + i, batcher.submit(offset + i)))
+
+    def stopper():
+        while not done.is_set():
+            batcher.shutdown(timeout=5)
+
+    threads = [threading.Thread(target=submitter, args=(n * 1000,)) for n in range(4)]
+    stop_thread = threading.Thread(target=stopper)
+    stop_thread.start()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    done.set()
+    stop_thread.join()
+
+    # Every item ran, and once shut down no worker (old or new) is left behind
+    assert all(future.result(timeout=5) == item * 2 for item, future in futures)
+    batcher.shutdown(timeout=5)
+    assert not [t for t in threading.enumerate() if t.name == name]
+
+
+def test_shutdown_finishes_queued_items():
+    def batch_fn(items):
+        time.sleep(0.05)
+        return _double(items)
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=1, max_wait=0.0)
+    futures = [batcher.submit(i) for i in range(3)]
+    batcher.shutdown()
+    assert [f.result(timeout=0) for f in futures] == [0, 2, 4]
+
+
+def test_cancelled_futures_are_skipped():
+    release = threading.Event()
+    seen = []
+
+    def batch_fn(items):
+        seen.append(list(items))
+        release.wait(5)
+        return _double(items)
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=1, max_wait=0.0)
+    first = batcher.submit(1)
+    # Wait until the worker is busy with the first item, then queue and cancel the second
+    while not seen:
+        time.sleep(0.001)
+    cancelled = batcher.submit(2)
+    assert cancelled.cancel()
+    kept = batcher.submit(3)
+    release.set()
+
+    assert first.result(timeout=5) == 2
+    assert kept.result(timeout=5) == 6
+    assert cancelled.cancelled()
+    assert seen == [[1], [3]]
+    batcher.shutdown()
+
+
+def test_submit_async_batches_concurrent_callers():
+    sizes = []
+
+    def batch_fn(items):
+        sizes.append(len(items))
+        return _double(items)
+
+    batcher = MicroBatcher(batch_fn, max_batch_size=8, max_wait=0.2)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit_async(i) for i in range(8)))
+
+    assert asyncio.run(run()) == [i * 2 for i in range(8)]
+    assert sizes == [8]
+    batcher.shutdown()
@@ -0,0 +1,44 @@
+"""
+Tests for utils.movie_recommendations against the original per-request CSV scan
+Run from backend/: python -m pytest tests
+"""
+
+import pytest
+
+from utils.movie_recommendations import get_movie_recommendations, load_movies
+
+
+def old_scan_titles(query, genre=None):
+    """The filtering get_movie_recommendations did before the in-memory catalog"""
+    movies = load_movies()
+    if genre:
+        movies = [m for m in movies if m.get('genre', '').lower() == genre.lower()]
+    q = (query or '').lower().strip()
+    if q:
+        movies = [m for m in movies if q in m.get('title', '').lower() or q in m.get('description', '').lower()]
+    return [m['title'] for m in movies]
+
+
+def _queries():
+    queries = {"", "a", "an", "ove", "the dark", "zzz", "  Love ", "-", "sci-fi"}
+    for movie in load_movies():
+        for text in (movie['title'].lower(), movie['description'].lower()):
+            # Fragments starting mid-word and spanning spaces
+            for start in range(0, len(text), 4):
+                queries.add(text[start:start + 2])
+                queries.add(text[start:start + 6])
+    return sorted(queries)
+
+
+@pytest.mark.parametrize("genre", [None, "Romance", "romance", "Action", "Sci-Fi", "Unknown"])
+def test_matches_old_scan(genre):
+    for query in _queries():
+        got = [m['title'] for m in get_movie_recommendations(query, genre)]
+        assert got == old_scan_titles(query, genre), (query, genre)
+
+
+def test_rows_are_fresh_dicts():
+    first = get_movie_recommendations("")[0]
+    first['title'] = "changed"
+    assert get_movie_recommendations("")[0]['title'] != "changed"
+    assert set(first) == {'title', 'genre', 'description', 'image', 'link'}
@@ -0,0 +1,78 @@
+"""
+Tests for utils.search_index and the static catalog search built on it
+Run from backend/: python -m pytest tests
+"""
+
+import pytest
+
+from data import recommendations as rec
+from routers.recommendations import search_static
+from utils.search_index import InvertedIndex, normalize_query
+
+# Searchable fields per content type: (dataset, id offset, fields)
+STATIC_FIELDS = {
+    "movies": (rec.movies, 0, ("title", "genre")),
+    "books": (rec.books, 1000, ("title", "genre", "author")),
+    "products": (rec.products, 2000, ("name", "category")),
+    "blogs": (rec.blogs, 3000, ("title", "topic")),
+}
+
+
+def old_scan_ids(content_type, query):
+    """The substring scan search_static used before the index"""
+    items, offset, fields = STATIC_FIELDS[content_type]
+    normalized_query = normalize_query(query)
+    ids = []
+    for i, item in enumerate(items):
+        values = [normalize_query(item.get(f, "")) for f in fields]
+        if content_type == "books":
+            include = (
+                not normalized_query or normalized_query in ["books", "book"]
+                or any(word in value for word in normalized_query.split() for value in values)
+            )
+        else:
+            include = not normalized_query or any(normalized_query in value for value in values)
+        if include:
+            ids.append(offset + i + 1)
+    return ids
+
+
+def _queries():
+    queries = {"", "watch", "ception", "une", "bert", "an d", "a", "ove", "sci-fi", "the dark", "zzz", "  Dune  "}
+    for items, _, fields in STATIC_FIELDS.values():
+        for item in items:
+            for f in fields:
+                value = normalize_query(item.get(f, ""))
+                # Fragments starting mid-word and spanning spaces
+                for start in range(0, len(value), 3):
+                    queries.add(value[start:start + 2])
+                    queries.add(value[start:start + 5])
+    return sorted(queries)
+
+
+@pytest.mark.parametrize("content_type", sorted(STATIC_FIELDS))
+def test_search_static_matches_old_scan(content_type):
+    for query in _queries():
+        got = [row["id"] for row in search_static(content_type, query)]
+        assert got == old_scan_ids(content_type, query), query
+
+
+def test_reported_regressions():
+    assert [r["title"] for r in search_static("products", "watch")] == ["Smartwatch Pro X"]
+    assert [r["title"] for r in search_static("movies", "ception")] == ["Inception"]
+    assert [r["title"] for r in search_static("books", "une")] == ["Dune"]
+    assert [r["title"] for r in search_static("books", "bert")] == ["Dune"]
+    assert len(search_static("books", "an d")) == len(old_scan_ids("books", "an d"))
+
+
+def test_lookup_is_superset_of_substring_matches():
+    texts = ["interstellar", "the dark knight", "a", "notebook", ""]
+    index = InvertedIndex()
+    for doc_id, text in enumerate(texts):
+        index.add(doc_id, text)
+    for fragment in ["", "a", "k k", "ook", "tebo", "stellar", "rk kn", "x", "dark night"]:
+        expected = {i for i, text in enumerate(texts) if fragment in text}
+        assert expected <= index.lookup(fragment), fragment
+    assert index.lookup("x") == set()
+    assert index.match_all(["dark", "kni"]) == {1}
+    assert index.match_any(["ook", "stel"]) == {0, 3}
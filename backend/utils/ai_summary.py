@@ -1,10 +1,18 @@
+import asyncio
+import hashlib
+import json
 import os
-from typing import List, Dict, Optional
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Dict, Optional
 from dotenv import load_dotenv
 import logging
-from transformers import pipeline, AutoModelForCausalLM, AutoTokenizer
-import torch
-import openai
+
+from .batching import MicroBatcher
+from .cache import SimpleCache
+from .disk_cache import SQLiteCacheStore
+from .http_client import HTTP_MAX_CONNECTIONS, HTTP_MAX_KEEPALIVE_CONNECTIONS, HTTP_KEEPALIVE_EXPIRY
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -13,29 +21,152 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+# Hugging Face model used when no OpenAI key is set
+LOCAL_SUMMARY_MODEL = os.getenv("LOCAL_SUMMARY_MODEL", "google/flan-t5-small")
+# Never load the local model (summaries fall back to the template without OpenAI)
+DISABLE_LOCAL_SUMMARY_MODEL = os.getenv("DISABLE_LOCAL_SUMMARY_MODEL", "false").lower() in ("1", "true", "yes")
+# Load the local model in the background at startup instead of on the first summary
+WARM_UP_SUMMARY_MODEL = os.getenv("WARM_UP_SUMMARY_MODEL", "false").lower() in ("1", "true", "yes")
+# Concurrent local prompts are generated together: up to this many per batch...
+SUMMARY_BATCH_MAX_SIZE = int(os.getenv("SUMMARY_BATCH_MAX_SIZE", 8))
+# ...collected for at most this long after the first one arrives
+SUMMARY_BATCH_WAIT_MS = float(os.getenv("SUMMARY_BATCH_WAIT_MS", 15))
+
+# Most seconds to wait for the next streamed token from the local model
+SUMMARY_STREAM_TOKEN_TIMEOUT = float(os.getenv("SUMMARY_STREAM_TOKEN_TIMEOUT", 30))
+# Local streams generating at once; further streams wait for a free slot
+SUMMARY_STREAM_MAX_CONCURRENCY = int(os.getenv("SUMMARY_STREAM_MAX_CONCURRENCY", 2))
+
+# OpenAI calls: timeout per attempt, total budget across retries, and retries after the first attempt.
+# Past the deadline the template summary is returned instead.
+OPENAI_SUMMARY_TIMEOUT = float(os.getenv("OPENAI_SUMMARY_TIMEOUT", 4))
+OPENAI_SUMMARY_DEADLINE = float(os.getenv("OPENAI_SUMMARY_DEADLINE", 8))
+OPENAI_SUMMARY_MAX_RETRIES = int(os.getenv("OPENAI_SUMMARY_MAX_RETRIES", 2))
+# Retry n waits a random time up to base * 2^n (full jitter)
+OPENAI_RETRY_BASE_DELAY = float(os.getenv("OPENAI_RETRY_BASE_DELAY", 0.25))
+
+# Generated summaries are reused for the same query and top titles
+SUMMARY_CACHE_TTL_MINUTES = int(os.getenv("SUMMARY_CACHE_TTL_MINUTES", 60))
+SUMMARY_CACHE_MAX_ENTRIES = int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", 2000))
+# Optional persistent tier shared by workers and kept across restarts
+SUMMARY_CACHE_DB_PATH = os.getenv("SUMMARY_CACHE_DB_PATH")
+
+summary_cache = SimpleCache(
+    default_ttl_minutes=SUMMARY_CACHE_TTL_MINUTES,
+    max_entries=SUMMARY_CACHE_MAX_ENTRIES,
+    max_bytes=int(os.getenv("SUMMARY_CACHE_MAX_BYTES", 4 * 1024 * 1024)),
+    store=SQLiteCacheStore(SUMMARY_CACHE_DB_PATH) if SUMMARY_CACHE_DB_PATH else None,
+)
+
+
+def summary_cache_key(query: str, recommendations: List[Dict]) -> str:
+    """
+    Content-addressed key: hash of the normalized query and the titles the summary mentions
+
+    Returns:
+        "summary:<sha256 hex>"
+    """
+    normalized = " ".join((query or "").lower().split())
+    titles = [r.get("title") for r in recommendations[:3]]
+    digest = hashlib.sha256(json.dumps([normalized, titles], default=str).encode("utf-8")).hexdigest()
+    return f"summary:{digest}"
+
+
 class AISummarizer:
-    def __init__(self):
-        """Initialize the AI summarizer with either OpenAI or local model."""
+    def __init__(self, cache: Optional[SimpleCache] = None):
+        """
+        Initialize the AI summarizer with either OpenAI or local model.
+        Nothing heavy happens here: transformers/torch are only imported and
+        the local model only built on the first local summary (or warm_up()).
+
+        Args:
+            cache: Cache for generated summaries (None disables caching)
+        """
+        self.cache = cache
         self.openai_key = os.getenv("OPENAI_API_KEY")
-        self.local_model = None
         self.using_openai = bool(self.openai_key)
+        self.local_model_enabled = not self.using_openai and not DISABLE_LOCAL_SUMMARY_MODEL
+        self._local_model: Any = None
+        self._local_model_loaded = False
+        self._load_lock = threading.Lock()
+        self._openai_client: Any = None
+        self._async_openai_client: Any = None
+        self._warm_up_future: Optional[asyncio.Future] = None
+        # Streamed local summaries bypass the batcher; this pool bounds how many generate at once
+        self._stream_executor: Optional[ThreadPoolExecutor] = None
+        # Local generation runs on the batcher's worker thread, one pipeline call per batch
+        self.local_batcher = MicroBatcher(
+            self._run_local_batch,
+            max_batch_size=SUMMARY_BATCH_MAX_SIZE,
+            max_wait=SUMMARY_BATCH_WAIT_MS / 1000,
+            name="summary-batcher",
+        )
 
         if self.using_openai:
-            openai.api_key = self.openai_key
             logger.info("Using OpenAI for summaries")
+        elif self.local_model_enabled:
+            logger.info(f"OpenAI key not found, local model '{LOCAL_SUMMARY_MODEL}' will load on first use")
         else:
-            logger.info("OpenAI key not found, falling back to local model")
-            try:
-                # Initialize FLAN-T5-small for efficient local summarization
-                self.local_model = pipeline(
-                    "text2text-generation",
-                    model="google/flan-t5-small",
-                    device="cuda" if torch.cuda.is_available() else "cpu"
-                )
-                logger.info("Local model initialized successfully")
-            except Exception as e:
-                logger.error(f"Error loading local model: {str(e)}")
-                self.local_model = None
+            logger.info("OpenAI key not found and local model disabled, using template summaries")
+
+    @property
+    def local_model(self) -> Any:
+        """The local text2text pipeline, loaded on first access (None if disabled or unavailable)."""
+        if not self._local_model_loaded:
+            self._load_local_model()
+        return self._local_model
+
+    def _load_local_model(self) -> None:
+        with self._load_lock:
+            if self._local_model_loaded:
+                return
+            if self.local_model_enabled:
+                try:
+                    # Heavy imports are deferred until a local summary is actually needed
+                    from transformers import pipeline
+                    import torch
+
+                    # Initialize FLAN-T5-small for efficient local summarization
+                    self._local_model = pipeline(
+                        "text2text-generation",
+                        model=LOCAL_SUMMARY_MODEL,
+                        device="cuda" if torch.cuda.is_available() else "cpu"
+                    )
+                    logger.info("Local model initialized successfully")
+                except Exception as e:
+                    logger.error(f"Error loading local model: {str(e)}")
+                    self._local_model = None
+            # Don't retry a failed load on every request
+            self._local_model_loaded = True
+
+    def warm_up(self) -> None:
+        """Load the local model ahead of the first request (no-op with OpenAI or when disabled)."""
+        if self.local_model_enabled:
+            self._load_local_model()
+
+    def start_warm_up(self) -> asyncio.Future:
+        """
+        Run warm_up() on the default executor without waiting for it.
+        A failure is logged when it happens; aclose() waits for a load still in progress.
+        """
+        future = asyncio.get_running_loop().run_in_executor(None, self.warm_up)
+        future.add_done_callback(self._on_warm_up_done)
+        self._warm_up_future = future
+        return future
+
+    @staticmethod
+    def _on_warm_up_done(future: asyncio.Future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(f"Summary model warm-up failed: {str(future.exception())}")
+
+    def shutdown(self) -> None:
+        """Stop the local batching worker and stream pool (both restart on next use) and close the cache's disk tier."""
+        self.local_batcher.shutdown()
+        if self._stream_executor is not None:
+            self._stream_executor.shutdown(wait=False, cancel_futures=True)
+            self._stream_executor = None
+        if self.cache is not None:
+            self.cache.close_store()
 
     def _format_recommendations(self, recommendations: List[Dict]) -> str:
         """Format the recommendations into a readable string."""
@@ -44,20 +175,67 @@ class AISummarizer:
             titles[-1] = f"and {titles[-1]}"
         return ", ".join(titles)
 
+    def _openai_messages(self, query: str, recommendations: List[Dict]) -> List[Dict[str, str]]:
+        titles = self._format_recommendations(recommendations)
+        prompt = f"""Given a user query "{query}" and these recommendations: {titles},
+        generate a short, natural summary (2-3 sentences) explaining why these items were recommended.
+        Make it conversational and engaging."""
+        return [
+            {"role": "system", "content": "You are a helpful recommendation system assistant."},
+            {"role": "user", "content": prompt}
+        ]
+
+    def _get_async_openai_client(self) -> Any:
+        """
+        Shared AsyncOpenAI client on a pooled httpx connection pool, created on first use.
+        Retries are ours (see _generate_openai_summary_async), so the SDK's are off.
+        """
+        if self._async_openai_client is None:
+            import httpx
+            from openai import AsyncOpenAI
+            self._async_openai_client = AsyncOpenAI(
+                api_key=self.openai_key,
+                timeout=OPENAI_SUMMARY_TIMEOUT,
+                max_retries=0,
+                http_client=httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=HTTP_MAX_CONNECTIONS,
+                        max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+                    ),
+                    timeout=OPENAI_SUMMARY_TIMEOUT,
+                ),
+            )
+        return self._async_openai_client
+
+    async def aclose(self) -> None:
+        """
+        Wait for a background warm-up still loading the model (it can't be
+        interrupted), then close the async OpenAI client's connection pool
+        (reopened on next use).
+        """
+        if self._warm_up_future is not None:
+            future, self._warm_up_future = self._warm_up_future, None
+            if not future.done():
+                await asyncio.wait({future})
+        if self._async_openai_client is not None:
+            client, self._async_openai_client = self._async_openai_client, None
+            await client.close()
+
     def _generate_openai_summary(self, query: str, recommendations: List[Dict]) -> str:
-        """Generate summary using OpenAI API."""
+        """Generate summary using OpenAI API (blocking; async routes use _generate_openai_summary_async)."""
         try:
-            titles = self._format_recommendations(recommendations)
-            prompt = f"""Given a user query "{query}" and these recommendations: {titles},
-            generate a short, natural summary (2-3 sentences) explaining why these items were recommended.
-            Make it conversational and engaging."""
+            if self._openai_client is None:
+                from openai import OpenAI
+                self._openai_client = OpenAI(
+                    api_key=self.openai_key,
+                    timeout=OPENAI_SUMMARY_TIMEOUT,
+                    max_retries=OPENAI_SUMMARY_MAX_RETRIES
+                )
 
-            response = openai.ChatCompletion.create(
+            response = self._openai_client.chat.completions.create(
                 model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a helpful recommendation system assistant."},
-                    {"role": "user", "content": prompt}
-                ],
+                messages=self._openai_messages(query, recommendations),
                 max_tokens=150,
                 temperature=0.7
             )
@@ -67,27 +245,228 @@ class AISummarizer:
             logger.error(f"OpenAI API error: {str(e)}")
             return None
 
-    def _generate_local_summary(self, query: str, recommendations: List[Dict]) -> str:
-        """Generate summary using local model."""
-        try:
-            if not self.local_model:
-                raise ValueError("Local model not initialized")
+    @staticmethod
+    def _is_retryable(error: Exception) -> bool:
+        """Timeouts, connection errors, rate limits and 5xx are worth retrying; other API errors and bugs are not."""
+        if isinstance(error, asyncio.TimeoutError):
+            return True
+        import openai
+        if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError, openai.RateLimitError)):
+            return True
+        return isinstance(error, openai.APIStatusError) and error.status_code >= 500
+
+    async def _call_openai(self, attempt_fn: Callable[[float], Awaitable[Any]]) -> Optional[Any]:
+        """
+        Run attempt_fn(timeout) within OPENAI_SUMMARY_DEADLINE. Each attempt gets at
+        most OPENAI_SUMMARY_TIMEOUT (less if the deadline is closer); retryable
+        failures are retried with jittered exponential backoff.
+
+        Returns:
+            attempt_fn's result, or None if every attempt failed or the deadline passed
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + OPENAI_SUMMARY_DEADLINE
+
+        for attempt in range(OPENAI_SUMMARY_MAX_RETRIES + 1):
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            timeout = min(OPENAI_SUMMARY_TIMEOUT, remaining)
+            try:
+                # wait_for enforces the budget even if the SDK's own timeout doesn't fire
+                return await asyncio.wait_for(attempt_fn(timeout), timeout=timeout)
+            except Exception as e:
+                error = "timed out" if isinstance(e, asyncio.TimeoutError) else str(e)
+                if not self._is_retryable(e) or attempt == OPENAI_SUMMARY_MAX_RETRIES:
+                    logger.error(f"OpenAI API error: {error}")
+                    return None
+                delay = random.uniform(0, OPENAI_RETRY_BASE_DELAY * 2 ** attempt)
+                if loop.time() + delay >= deadline:
+                    break
+                logger.warning(f"⚠️ OpenAI attempt {attempt + 1} failed ({error}), retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
 
-            titles = self._format_recommendations(recommendations)
-            prompt = f"Summarize recommendations for query '{query}' with items: {titles}"
+        logger.error(f"OpenAI summary deadline of {OPENAI_SUMMARY_DEADLINE}s exceeded, using template")
+        return None
 
-            result = self.local_model(
-                prompt,
-                max_length=100,
-                min_length=30,
-                num_beams=4
+    async def _generate_openai_summary_async(self, query: str, recommendations: List[Dict]) -> Optional[str]:
+        """
+        Generate summary with the async OpenAI client within OPENAI_SUMMARY_DEADLINE.
+
+        Returns:
+            Summary text, or None if every attempt failed or the deadline passed
+        """
+        messages = self._openai_messages(query, recommendations)
+
+        async def attempt(timeout: float) -> str:
+            response = await self._get_async_openai_client().chat.completions.create(
+                model="gpt-3.5-turbo",
+                messages=messages,
+                max_tokens=150,
+                temperature=0.7,
+                timeout=timeout
             )
+            return response.choices[0].message.content.strip()
+
+        return await self._call_openai(attempt)
+
+    def _local_prompt(self, query: str, recommendations: List[Dict]) -> str:
+        titles = self._format_recommendations(recommendations)
+        return f"Summarize recommendations for query '{query}' with items: {titles}"
+
+    def _run_local_batch(self, prompts: List[str]) -> List[str]:
+        """Generate summaries for several prompts in one pipeline call (runs on the batcher thread)."""
+        if not self.local_model:
+            raise ValueError("Local model not initialized")
+
+        results = self.local_model(
+            prompts,
+            max_length=100,
+            min_length=30,
+            num_beams=4,
+            batch_size=len(prompts)
+        )
+
+        # One result per prompt, either a dict or a single-item list of dicts
+        return [(r[0] if isinstance(r, list) else r)['generated_text'].strip() for r in results]
+
+    def _generate_local_summary(self, query: str, recommendations: List[Dict]) -> str:
+        """Generate summary using local model, batched with other concurrent requests."""
+        try:
+            return self.local_batcher.submit(self._local_prompt(query, recommendations)).result()
+        except Exception as e:
+            logger.error(f"Local model error: {str(e)}")
+            return None
 
-            return result[0]['generated_text'].strip()
+    async def _generate_local_summary_async(self, query: str, recommendations: List[Dict]) -> str:
+        """Async variant of _generate_local_summary; the event loop stays free during generation."""
+        try:
+            return await self.local_batcher.submit_async(self._local_prompt(query, recommendations))
         except Exception as e:
             logger.error(f"Local model error: {str(e)}")
             return None
 
+    async def _stream_openai_summary(self, query: str, recommendations: List[Dict]) -> AsyncIterator[str]:
+        """
+        Yield summary text deltas from a streaming OpenAI chat completion.
+        Opening the stream and waiting for its first text are retried within
+        OPENAI_SUMMARY_DEADLINE like _generate_openai_summary_async; nothing is
+        yielded if that fails. Later chunks are only bounded by the per-read
+        OPENAI_SUMMARY_TIMEOUT, and their failures are raised, not retried.
+        """
+        messages = self._openai_messages(query, recommendations)
+
+        def delta(chunk: Any) -> Optional[str]:
+            return chunk.choices[0].delta.content if chunk.choices else None
+
+        async def open_stream(timeout: float) -> Any:
+            stream = await self._get_async_openai_client().chat.completions.create(
+                model="gpt-3.5-turbo",
+                messages=messages,
+                max_tokens=150,
+                temperature=0.7,
+                timeout=timeout,
+                stream=True
+            )
+            # One iterator for the whole stream, so the rest resumes after the first text
+            chunks = stream.__aiter__()
+            try:
+                async for chunk in chunks:
+                    if delta(chunk):
+                        return stream, chunks, delta(chunk)
+            except BaseException:
+                await stream.close()
+                raise
+            return stream, chunks, None
+
+        opened = await self._call_openai(open_stream)
+        if opened is None:
+            return
+        stream, chunks, first = opened
+        try:
+            if first:
+                yield first
+            async for chunk in chunks:
+                if delta(chunk):
+                    yield delta(chunk)
+        finally:
+            await stream.close()
+
+    def _get_stream_executor(self) -> ThreadPoolExecutor:
+        if self._stream_executor is None:
+            self._stream_executor = ThreadPoolExecutor(
+                max_workers=SUMMARY_STREAM_MAX_CONCURRENCY, thread_name_prefix="summary-stream"
+            )
+        return self._stream_executor
+
+    def _run_local_stream(self, prompt: str, emit: Callable[[str], None], stop: threading.Event) -> None:
+        """
+        Generate on a stream pool thread, passing each decoded piece of text to emit().
+        Streaming decodes greedily (streamers don't support beam search) and ends
+        early once stop is set.
+        """
+        if stop.is_set():
+            return
+        if not self.local_model:
+            raise ValueError("Local model not initialized")
+        import torch
+        from transformers import StoppingCriteria, StoppingCriteriaList, TextStreamer
+
+        class _EmitStreamer(TextStreamer):
+            def on_finalized_text(self, text: str, stream_end: bool = False) -> None:
+                if text:
+                    emit(text)
+
+        class _StopWhenSet(StoppingCriteria):
+            def __call__(self, input_ids, scores, **kwargs):
+                return torch.full((input_ids.shape[0],), stop.is_set(), dtype=torch.bool, device=input_ids.device)
+
+        tokenizer, model = self.local_model.tokenizer, self.local_model.model
+        inputs = tokenizer(prompt, return_tensors="pt").to(model.device)
+        model.generate(
+            **inputs,
+            streamer=_EmitStreamer(tokenizer, skip_special_tokens=True),
+            stopping_criteria=StoppingCriteriaList([_StopWhenSet()]),
+            max_length=100,
+            min_length=30
+        )
+
+    async def _stream_local_summary(self, query: str, recommendations: List[Dict]) -> AsyncIterator[str]:
+        """
+        Yield summary text from the local model as it is decoded. Loading the model
+        and generating both happen on one stream pool thread, which hands text back
+        to the event loop as it is produced; closing the iterator stops generation.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+
+        def emit(text: str) -> None:
+            if not stop.is_set():
+                loop.call_soon_threadsafe(queue.put_nowait, text)
+
+        future = loop.run_in_executor(
+            self._get_stream_executor(), self._run_local_stream, self._local_prompt(query, recommendations), emit, stop
+        )
+        # Runs after every emit() callback already scheduled, so no text is lost
+        future.add_done_callback(lambda _: queue.put_nowait(None))
+        try:
+            while True:
+                # The first wait includes any wait for a free stream slot
+                chunk = await asyncio.wait_for(queue.get(), timeout=SUMMARY_STREAM_TOKEN_TIMEOUT)
+                if chunk is None:
+                    break
+                yield chunk
+            future.result()
+        finally:
+            stop.set()
+            future.cancel()
+
+    def _template_summary(self, query: str, recommendations: List[Dict]) -> str:
+        titles = self._format_recommendations(recommendations)
+        category = "items"  # You could extract this from the query
+        return f"Here are some {category} we found for your query '{query}'. The recommendations include {titles}."
+
     def generate_summary(self, query: str, recommendations: List[Dict]) -> str:
         """
         Generate a natural language summary of recommendations.
@@ -96,20 +475,98 @@ class AISummarizer:
         if not recommendations:
             return f"Sorry, we couldn't find any recommendations matching your query: '{query}'"
 
+        key = summary_cache_key(query, recommendations)
+        summary = self.cache.get(key) if self.cache is not None else None
+        if summary:
+            return summary
+
         # Try AI-generated summary
-        summary = None
         if self.using_openai:
             summary = self._generate_openai_summary(query, recommendations)
-        elif self.local_model:
+        elif self.local_model_enabled and self.local_model:
             summary = self._generate_local_summary(query, recommendations)
 
-        # Fall back to template if AI generation fails
+        # Fall back to template if AI generation fails (template summaries aren't cached)
+        if not summary:
+            return self._template_summary(query, recommendations)
+
+        if self.cache is not None:
+            self.cache.set(key, summary)
+        return summary
+
+    async def generate_summary_async(self, query: str, recommendations: List[Dict]) -> str:
+        """
+        generate_summary for async routes.
+        Local summaries are micro-batched with other in-flight requests; the
+        model is loaded and run off the event loop. OpenAI calls use the async
+        client and fall back to the template once OPENAI_SUMMARY_DEADLINE passes.
+        """
+        if not recommendations:
+            return f"Sorry, we couldn't find any recommendations matching your query: '{query}'"
+
+        async def generate() -> Optional[str]:
+            if self.using_openai:
+                return await self._generate_openai_summary_async(query, recommendations)
+            if self.local_model_enabled:
+                return await self._generate_local_summary_async(query, recommendations)
+            return None
+
+        if self.cache is not None:
+            # Concurrent requests for the same summary share one generation; failures (None) aren't cached
+            summary, _ = await self.cache.get_or_fetch(summary_cache_key(query, recommendations), generate)
+        else:
+            summary = await generate()
+
         if not summary:
-            titles = self._format_recommendations(recommendations)
-            category = "items"  # You could extract this from the query
-            return f"Here are some {category} we found for your query '{query}'. The recommendations include {titles}."
+            return self._template_summary(query, recommendations)
 
         return summary
 
+    async def stream_summary(self, query: str, recommendations: List[Dict]) -> AsyncIterator[str]:
+        """
+        Like generate_summary_async, but yields the summary as it is generated.
+        Cached summaries and the template fallback come as a single chunk;
+        only completely streamed summaries are cached. A failure before any
+        text falls back to the template; a failure after some text is raised,
+        so callers can tell the summary is incomplete.
+        """
+        if not recommendations:
+            yield f"Sorry, we couldn't find any recommendations matching your query: '{query}'"
+            return
+
+        key = summary_cache_key(query, recommendations)
+        cached = await self.cache.aget(key) if self.cache is not None else None
+        if cached:
+            yield cached
+            return
+
+        source = None
+        if self.using_openai:
+            source = self._stream_openai_summary(query, recommendations)
+        elif self.local_model_enabled:
+            source = self._stream_local_summary(query, recommendations)
+
+        chunks: List[str] = []
+        completed = False
+        if source is not None:
+            try:
+                async for chunk in source:
+                    chunks.append(chunk)
+                    yield chunk
+                completed = True
+            except Exception as e:
+                error = "timed out" if isinstance(e, asyncio.TimeoutError) else str(e)
+                logger.error(f"Summary streaming error: {error}")
+                if chunks:
+                    raise
+
+        summary = "".join(chunks).strip()
+        if completed and summary:
+            if self.cache is not None:
+                self.cache.set(key, summary)
+        elif not chunks:
+            yield self._template_summary(query, recommendations)
+
+
 # Create a global instance
-summarizer = AISummarizer()
\ No newline at end of file
+summarizer = AISummarizer(cache=summary_cache)
\ No newline at end of file
@@ -0,0 +1,130 @@
+"""
+Micro-batching for blocking batch functions (e.g. a seq2seq pipeline)
+Concurrent submissions are collected over a short window and run as one
+batch call on a dedicated worker thread
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Sentinel that tells a worker thread to exit (each worker has its own queue)
+_STOP = object()
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Runs batch_fn over items submitted from any thread or event loop
+
+    The worker takes the first waiting item, then keeps collecting until
+    max_batch_size items are queued or max_wait seconds have passed, and
+    calls batch_fn once with all of them. batch_fn must return one result
+    per item, in order; if it raises, every caller in the batch gets the error.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[T]], Sequence[R]],
+        max_batch_size: int = 8,
+        max_wait: float = 0.015,
+        name: str = "micro-batcher",
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait)
+        self.name = name
+        # Queue of the current worker; shutdown() hands it to the exiting worker and starts a fresh one
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        # Held while queueing and while swapping workers, so nothing lands in a stopped worker's queue
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+
+    def _ensure_worker(self) -> None:
+        """Start a worker on the current queue if none is running; caller holds the lock"""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, args=(self._queue,), name=self.name, daemon=True)
+            self._thread.start()
+
+    def submit(self, item: T) -> "Future[R]":
+        """Queue an item; the returned future resolves with its result"""
+        future: "Future[R]" = Future()
+        with self._lock:
+            self._ensure_worker()
+            self._queue.put((item, future))
+        return future
+
+    async def submit_async(self, item: T) -> R:
+        """submit() and await the result without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(item))
+
+    def _collect(
+        self, work_queue: "queue.Queue", first: Tuple[T, "Future[R]"]
+    ) -> Tuple[List[Tuple[T, "Future[R]"]], bool]:
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                entry = work_queue.get(timeout=remaining) if remaining > 0 else work_queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is _STOP:
+                return batch, True
+            batch.append(entry)
+        return batch, False
+
+    def _run(self, work_queue: "queue.Queue") -> None:
+        stopping = False
+        while not stopping:
+            entry = work_queue.get()
+            if entry is _STOP:
+                break
+            batch, stopping = self._collect(work_queue, entry)
+            # Skip callers that gave up (cancelled futures) before running the batch
+            batch = [(item, future) for item, future in batch if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                results = list(self.batch_fn([item for item, _ in batch]))
+                if len(results) != len(batch):
+                    raise RuntimeError(f"{self.name}: batch_fn returned {len(results)} results for {len(batch)} items")
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+            else:
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+            self.batches += 1
+            self.items += len(batch)
+
+    def get_stats(self) -> dict:
+        """Batches run and items processed so far"""
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+        }
+
+    def shutdown(self, timeout: Optional[float] = 5.0) -> None:
+        """Finish queued items and stop the worker (it restarts on next submit)"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is None:
+                return
+            # Items submitted from now on go to a new worker with its own queue
+            work_queue, self._queue = self._queue, queue.Queue()
+            work_queue.put(_STOP)
+        thread.join(timeout)
@@ -1,7 +1,7 @@
-import httpx
 import asyncio
 from typing import List, Dict, Any, Optional
 import logging
+from .http_client import get_client
 
 logger = logging.getLogger(__name__)
 
@@ -24,12 +24,12 @@ async def fetch_books_from_google_api(query: str, max_results: int = 5) -> List[
         if len(clean_query.split()) < 2:
             clean_query += " programming" if "programming" in query.lower() else " fiction"
 
-        url = f"https://www.googleapis.com/books/v1/volumes?q={clean_query}&maxResults={max_results}&orderBy=relevance"
+        url = f"/volumes?q={clean_query}&maxResults={max_results}&orderBy=relevance"
 
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(url)
-            response.raise_for_status()
-            data = response.json()
+        client = get_client("google_books")
+        response = await client.get(url)
+        response.raise_for_status()
+        data = response.json()
 
         books = []
         if "items" in data:
@@ -1,119 +1,680 @@
 """
-Simple in-memory cache for TMDB API responses
-Caches data for 10 minutes to reduce API calls
+Bounded in-memory cache for TMDB API responses
+LRU eviction by entry count and approximate size, monotonic-clock TTL expiry,
+optional stale-while-revalidate between a soft and a hard TTL and an
+optional persistent tier (see disk_cache.py) that survives restarts.
+Persistent-tier I/O never runs on the event loop: async reads go through
+asyncio.to_thread and writes are applied by a background writer thread.
 """
 
-from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
+import asyncio
+import functools
 import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Dict, Any, Awaitable, Callable, Optional, Tuple
+
+from .disk_cache import SQLiteCacheStore
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Entry:
+    value: Any
+    fresh_until: float  # soft TTL: served as fresh until here
+    expires_at: float   # hard TTL: served as stale until here, then dropped
+    created_at: float
+    size: int
+    retry_at: float = 0.0  # earliest time for another background refresh
+
+
+def _wall_offset() -> float:
+    """Seconds to add to time.monotonic() to get epoch time"""
+    return time.time() - time.monotonic()
+
+
+def _estimate_size(value: Any) -> int:
+    """Approximate the memory footprint of a cached value in bytes"""
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return sys.getsizeof(value)
+
+
+class _StoreWriter:
+    """Applies persistent-tier writes in submission order on one background thread"""
+
+    def __init__(self):
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, description: str, fn: Callable[..., Any], *args: Any) -> None:
+        self._queue.put((description, fn, args))
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="disk-cache-writer", daemon=True)
+                    self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            op = self._queue.get()
+            if op is None:
+                return
+            description, fn, args = op
+            try:
+                fn(*args)
+            except Exception as e:
+                logger.warning(f"⚠️ Disk cache {description} failed: {e}")
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Apply the queued writes, then stop the thread"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout)
+
 
 class SimpleCache:
-    """In-memory cache with expiration"""
-    
-    def __init__(self, default_ttl_minutes: int = 10):
-        self._cache: Dict[str, Dict[str, Any]] = {}
+    """In-memory LRU cache with expiration and size bounds"""
+
+    def __init__(
+        self,
+        default_ttl_minutes: int = 10,
+        max_entries: int = 1000,
+        max_bytes: int = 50 * 1024 * 1024,
+        hard_ttl_minutes: Optional[int] = None,
+        refresh_backoff_seconds: float = 30.0,
+        store: Optional[SQLiteCacheStore] = None,
+    ):
+        self._cache: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._sweeper: Optional[asyncio.Task] = None
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # Per-namespace ("<namespace>:<rest>") entry limits and their LRU order
+        self._ns_limits: Dict[str, int] = {}
+        self._ns_keys: Dict[str, "OrderedDict[str, None]"] = {}
         self.default_ttl = timedelta(minutes=default_ttl_minutes)
-    
+        # Without a hard TTL entries expire at the soft TTL (no stale serving)
+        self.default_hard_ttl = timedelta(minutes=hard_ttl_minutes) if hard_ttl_minutes else None
+        self.refresh_backoff = refresh_backoff_seconds
+        # Optional second tier: read-through on memory miss, write-behind on set
+        self.store = store
+        self._store_closed = False
+        self._store_writer = _StoreWriter()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.coalesced = 0
+        self.stale_hits = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.store_hits = 0
+        self.negative_stores = 0
+
     def _generate_key(self, prefix: str, params: Dict[str, Any]) -> str:
         """Generate a cache key from prefix and parameters"""
         # Sort params for consistent keys
         sorted_params = sorted(params.items())
         params_str = json.dumps(sorted_params, sort_keys=True)
         return f"{prefix}:{params_str}"
-    
+
+    @staticmethod
+    def _namespace(key: str) -> str:
+        return key.partition(":")[0]
+
+    def set_namespace_limit(self, namespace: str, max_entries: int) -> None:
+        """
+        Cap the number of entries whose key starts with "<namespace>:"
+
+        Args:
+            namespace: Key prefix before the first colon
+            max_entries: Maximum entries kept for that namespace
+        """
+        with self._lock:
+            self._ns_limits[namespace] = max_entries
+            self._ns_keys.setdefault(namespace, OrderedDict(
+                (key, None) for key in self._cache if self._namespace(key) == namespace
+            ))
+            self._evict_overflow()
+
+    def _touch(self, key: str) -> None:
+        self._cache.move_to_end(key)
+        ns_keys = self._ns_keys.get(self._namespace(key))
+        if ns_keys is not None:
+            ns_keys.move_to_end(key)
+
+    def _remove(self, key: str) -> _Entry:
+        entry = self._cache.pop(key)
+        self._bytes -= entry.size
+        ns_keys = self._ns_keys.get(self._namespace(key))
+        if ns_keys is not None:
+            ns_keys.pop(key, None)
+        return entry
+
+    def _evict_overflow(self) -> None:
+        for namespace, ns_keys in self._ns_keys.items():
+            while len(ns_keys) > self._ns_limits[namespace]:
+                key, _ = ns_keys.popitem(last=False)
+                self._bytes -= self._cache.pop(key).size
+                self.evictions += 1
+        while self._cache and (len(self._cache) > self.max_entries or self._bytes > self.max_bytes):
+            key = next(iter(self._cache))
+            self._remove(key)
+            self.evictions += 1
+
+    def _insert(self, key: str, entry: _Entry) -> None:
+        with self._lock:
+            if key in self._cache:
+                self._remove(key)
+            self._cache[key] = entry
+            self._bytes += entry.size
+            ns_keys = self._ns_keys.get(self._namespace(key))
+            if ns_keys is not None:
+                ns_keys[key] = None
+            self._evict_overflow()
+
+    def _store_write(self, description: str, fn: Callable[..., Any], *args: Any) -> None:
+        """Queue a persistent-tier write; failures are logged, never raised to the caller"""
+        if self.store is not None and not self._store_closed:
+            self._store_writer.submit(description, fn, *args)
+
+    def _load_from_store(self, key: str) -> Optional[_Entry]:
+        if self.store is None or self._store_closed:
+            return None
+        try:
+            stored = self.store.get(key)
+        except Exception as e:
+            logger.warning(f"⚠️ Disk cache read failed for '{key}': {e}")
+            return None
+        if stored is None:
+            return None
+
+        _, value, fresh_until, expires_at = stored
+        offset = _wall_offset()
+        entry = _Entry(
+            value=value,
+            fresh_until=fresh_until - offset,
+            expires_at=expires_at - offset,
+            created_at=time.monotonic(),
+            size=_estimate_size(value),
+        )
+        self._insert(key, entry)
+        self.store_hits += 1
+        return entry
+
+    def _lookup_memory(self, key: str) -> Tuple[Optional[_Entry], bool]:
+        """
+        Look the key up in memory only
+
+        Returns:
+            (entry, expired): the entry if within its hard TTL; expired is
+            True if it was found past its hard TTL and dropped
+        """
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None, False
+            # Check if past the hard TTL
+            if time.monotonic() > entry.expires_at:
+                self._remove(key)
+                self.expirations += 1
+                return None, True
+
+            self._touch(key)
+            return entry, False
+
+    def _lookup(self, key: str) -> Optional[_Entry]:
+        """Return the entry if it is within its hard TTL, dropping it otherwise"""
+        entry, expired = self._lookup_memory(key)
+        if entry is not None or expired:
+            return entry
+        return self._load_from_store(key)
+
+    async def _lookup_async(self, key: str) -> Optional[_Entry]:
+        """_lookup() with the persistent-tier read moved off the event loop"""
+        entry, expired = self._lookup_memory(key)
+        if entry is not None or expired or self.store is None:
+            return entry
+        return await asyncio.to_thread(self._load_from_store, key)
+
+    def _fresh_value(self, entry: Optional[_Entry]) -> Optional[Any]:
+        if entry is None or time.monotonic() > entry.fresh_until:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry.value
+
     def get(self, key: str) -> Optional[Any]:
         """
         Get value from cache if it exists and hasn't expired
-        
+
+        Blocks on the persistent tier on a memory miss; use aget() from async code.
+
         Args:
             key: Cache key
-            
+
         Returns:
-            Cached value or None if not found/expired
+            Cached value or None if not found/expired (stale counts as expired)
         """
-        if key not in self._cache:
-            return None
-        
-        entry = self._cache[key]
-        
-        # Check if expired
-        if datetime.now() > entry['expires_at']:
-            # Remove expired entry
-            del self._cache[key]
-            return None
-        
-        return entry['value']
-    
-    def set(self, key: str, value: Any, ttl: Optional[timedelta] = None) -> None:
+        return self._fresh_value(self._lookup(key))
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """get() without blocking the event loop on the persistent tier"""
+        return self._fresh_value(await self._lookup_async(key))
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[timedelta] = None,
+        hard_ttl: Optional[timedelta] = None,
+    ) -> None:
         """
         Set value in cache with expiration
-        
+
         Args:
             key: Cache key
             value: Value to cache
-            ttl: Time to live (defaults to default_ttl)
+            ttl: Soft time to live (defaults to default_ttl)
+            hard_ttl: How long the value may be served stale while it is
+                refreshed (defaults to default_hard_ttl, never below ttl)
         """
         if ttl is None:
             ttl = self.default_ttl
-        
-        self._cache[key] = {
-            'value': value,
-            'expires_at': datetime.now() + ttl,
-            'created_at': datetime.now()
-        }
-    
+        if hard_ttl is None:
+            hard_ttl = self.default_hard_ttl or ttl
+        hard_ttl = max(ttl, hard_ttl)
+
+        now = time.monotonic()
+        entry = _Entry(
+            value=value,
+            fresh_until=now + ttl.total_seconds(),
+            expires_at=now + hard_ttl.total_seconds(),
+            created_at=now,
+            size=_estimate_size(value),
+        )
+        self._insert(key, entry)
+
+        if self.store is not None:
+            offset = _wall_offset()
+            self._store_write(
+                f"write for '{key}'", self.store.set,
+                key, value, entry.fresh_until + offset, entry.expires_at + offset,
+            )
+
+    async def _fetch_and_store(
+        self,
+        key: str,
+        fetcher: Callable[[], Awaitable[Any]],
+        ttl: Optional[timedelta],
+        hard_ttl: Optional[timedelta],
+        negative_ttl: Optional[timedelta] = None,
+        is_negative: Optional[Callable[[Any], bool]] = None,
+        is_cacheable: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        try:
+            value = await fetcher()
+            if value is not None and is_cacheable is not None and not is_cacheable(value):
+                # Keep any stale entry, and back off before refreshing it again
+                with self._lock:
+                    entry = self._cache.get(key)
+                    if entry is not None:
+                        entry.retry_at = time.monotonic() + self.refresh_backoff
+            elif value is not None:
+                if negative_ttl is not None and is_negative is not None and is_negative(value):
+                    # Remember "nothing found" briefly and never serve it stale
+                    self.negative_stores += 1
+                    self.set(key, value, negative_ttl, negative_ttl)
+                else:
+                    self.set(key, value, ttl, hard_ttl)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def _start_fetch(
+        self,
+        key: str,
+        fetcher: Callable[[], Awaitable[Any]],
+        ttl: Optional[timedelta],
+        hard_ttl: Optional[timedelta],
+        negative_ttl: Optional[timedelta] = None,
+        is_negative: Optional[Callable[[Any], bool]] = None,
+        is_cacheable: Optional[Callable[[Any], bool]] = None,
+    ) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(
+                self._fetch_and_store(key, fetcher, ttl, hard_ttl, negative_ttl, is_negative, is_cacheable)
+            )
+            self._inflight[key] = task
+        return task
+
+    def _on_refresh_done(self, key: str, task: asyncio.Task) -> None:
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is None:
+            return
+        self.refresh_failures += 1
+        logger.warning(f"⚠️ Background refresh failed for '{key}', serving stale data: {error}")
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                entry.retry_at = time.monotonic() + self.refresh_backoff
+
+    async def get_or_fetch(
+        self,
+        key: str,
+        fetcher: Callable[[], Awaitable[Any]],
+        ttl: Optional[timedelta] = None,
+        hard_ttl: Optional[timedelta] = None,
+        negative_ttl: Optional[timedelta] = None,
+        is_negative: Optional[Callable[[Any], bool]] = None,
+        is_cacheable: Optional[Callable[[Any], bool]] = None,
+    ) -> Tuple[Any, bool]:
+        """
+        Get value from cache, or fetch it once for all concurrent callers
+
+        Concurrent misses on the same key share a single in-flight fetch; the
+        fetch runs as its own task so a cancelled caller doesn't abort it for
+        the others. Errors raised by the fetcher propagate to every waiter.
+
+        Past the soft TTL but within the hard TTL the stale value is returned
+        immediately and a background refresh is scheduled. A failed refresh
+        keeps the stale value and is retried after refresh_backoff seconds.
+
+        Values for which is_negative() is true (e.g. an empty upstream
+        result) are cached for negative_ttl only, without a stale window.
+        Values for which is_cacheable() is false (e.g. a response cut short
+        by a deadline) are returned but never stored, so a background
+        refresh that produces one keeps serving the previous entry.
+
+        Args:
+            key: Cache key
+            fetcher: Coroutine function producing the value on a miss
+            ttl: Soft time to live (defaults to default_ttl)
+            hard_ttl: Hard time to live (defaults to default_hard_ttl)
+            negative_ttl: Time to live for negative values
+            is_negative: Tells whether a fetched value is negative
+            is_cacheable: Tells whether a fetched value may be stored at all
+
+        Returns:
+            Tuple of (value, from_cache); from_cache is False only for the
+            caller whose request triggered the fetch
+        """
+        entry = await self._lookup_async(key)
+        if entry is not None:
+            now = time.monotonic()
+            if now <= entry.fresh_until:
+                self.hits += 1
+                return entry.value, True
+
+            # Stale: serve now, revalidate in the background
+            self.stale_hits += 1
+            if key not in self._inflight and now >= entry.retry_at:
+                self.refreshes += 1
+                task = self._start_fetch(key, fetcher, ttl, hard_ttl, negative_ttl, is_negative, is_cacheable)
+                task.add_done_callback(lambda t: self._on_refresh_done(key, t))
+            return entry.value, True
+
+        self.misses += 1
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return await asyncio.shield(task), True
+
+        task = self._start_fetch(key, fetcher, ttl, hard_ttl, negative_ttl, is_negative, is_cacheable)
+        return await asyncio.shield(task), False
+
     def delete(self, key: str) -> bool:
         """
         Delete a key from cache
-        
+
         Args:
             key: Cache key
-            
+
         Returns:
             True if key was deleted, False if not found
         """
-        if key in self._cache:
-            del self._cache[key]
-            return True
-        return False
-    
+        if self.store is not None:
+            self._store_write(f"delete for '{key}'", self.store.delete, key)
+        with self._lock:
+            if key in self._cache:
+                self._remove(key)
+                return True
+            return False
+
     def clear(self) -> None:
         """Clear all cache entries"""
-        self._cache.clear()
-    
+        if self.store is not None:
+            self._store_write("clear", self.store.clear)
+        with self._lock:
+            self._cache.clear()
+            for ns_keys in self._ns_keys.values():
+                ns_keys.clear()
+            self._bytes = 0
+
     def cleanup_expired(self) -> int:
         """
         Remove all expired entries
-        
+
         Returns:
             Number of entries removed
         """
-        now = datetime.now()
-        expired_keys = [
-            key for key, entry in self._cache.items()
-            if now > entry['expires_at']
-        ]
-        
-        for key in expired_keys:
-            del self._cache[key]
-        
+        now = time.monotonic()
+        with self._lock:
+            expired_keys = [
+                key for key, entry in self._cache.items()
+                if now > entry.expires_at
+            ]
+
+            for key in expired_keys:
+                self._remove(key)
+            self.expirations += len(expired_keys)
+
+        if self.store is not None:
+            self._store_write("cleanup", self.store.cleanup_expired)
+
         return len(expired_keys)
-    
+
+    def warm_from_store(self, limit: Optional[int] = None) -> int:
+        """
+        Load the most recently written entries from the persistent tier
+
+        Args:
+            limit: Maximum entries to load (defaults to max_entries)
+
+        Returns:
+            Number of entries loaded into memory
+        """
+        if self.store is None or self._store_closed:
+            return 0
+
+        limit = self.max_entries if limit is None else min(limit, self.max_entries)
+        try:
+            stored = self.store.load_recent(limit)
+        except Exception as e:
+            logger.warning(f"⚠️ Disk cache warm-up failed: {e}")
+            return 0
+
+        offset = _wall_offset()
+        now = time.monotonic()
+        # Oldest first so the newest keys end up most-recently-used
+        for key, value, fresh_until, expires_at in reversed(stored):
+            self._insert(key, _Entry(
+                value=value,
+                fresh_until=fresh_until - offset,
+                expires_at=expires_at - offset,
+                created_at=now,
+                size=_estimate_size(value),
+            ))
+        return len(stored)
+
+    def close_store(self) -> None:
+        """Apply pending writes and close the persistent tier; the cache keeps working from memory"""
+        if self.store is None or self._store_closed:
+            return
+        self._store_closed = True
+        self._store_writer.close()
+        try:
+            self.store.close()
+        except Exception as e:
+            logger.warning(f"⚠️ Disk cache close failed: {e}")
+
+    async def _sweep_loop(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            removed = self.cleanup_expired()
+            if removed:
+                logger.info(f"🧹 Cache sweeper removed {removed} expired entries")
+
+    def start_sweeper(self, interval: float = 60.0) -> None:
+        """
+        Start a background task that periodically removes expired entries
+
+        Args:
+            interval: Seconds between sweeps
+        """
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.get_running_loop().create_task(self._sweep_loop(interval))
+
+    async def stop_sweeper(self) -> None:
+        """Cancel the background sweeper task if it is running"""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
-        now = datetime.now()
-        active_entries = sum(
-            1 for entry in self._cache.values()
-            if now <= entry['expires_at']
-        )
-        
+        now = time.monotonic()
+        with self._lock:
+            active_entries = sum(
+                1 for entry in self._cache.values()
+                if now <= entry.fresh_until
+            )
+            stale_entries = sum(
+                1 for entry in self._cache.values()
+                if entry.fresh_until < now <= entry.expires_at
+            )
+            total_entries = len(self._cache)
+            size_bytes = self._bytes
+
+        lookups = self.hits + self.misses
         return {
-            'total_entries': len(self._cache),
+            'total_entries': total_entries,
             'active_entries': active_entries,
-            'expired_entries': len(self._cache) - active_entries
+            'stale_entries': stale_entries,
+            'expired_entries': total_entries - active_entries - stale_entries,
+            'size_bytes': size_bytes,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'coalesced': self.coalesced,
+            'inflight': len(self._inflight),
+            'stale_hits': self.stale_hits,
+            'refreshes': self.refreshes,
+            'refresh_failures': self.refresh_failures,
+            'store_hits': self.store_hits,
+            'negative_stores': self.negative_stores,
+            'store_enabled': self.store is not None and not self._store_closed,
+            'store_pending_writes': self._store_writer.pending,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
         }
 
 
-# Global cache instance
-tmdb_cache = SimpleCache(default_ttl_minutes=10)
+@dataclass(frozen=True)
+class CachePolicy:
+    """Declarative cache settings for one route"""
+    namespace: str
+    key: Callable[..., str]  # builds the key suffix from the route's parameters
+    ttl: timedelta
+    hard_ttl: Optional[timedelta] = None
+    max_entries: Optional[int] = None
+    # Short TTL for responses is_negative() flags (e.g. nothing found upstream)
+    negative_ttl: Optional[timedelta] = None
+    is_negative: Optional[Callable[[Any], bool]] = None
+    # Responses is_cacheable() rejects (e.g. partial results) are returned but not stored
+    is_cacheable: Optional[Callable[[Any], bool]] = None
+
+    def build_key(self, **params: Any) -> str:
+        return f"{self.namespace}:{self.key(**params)}"
+
+
+def cached(cache: SimpleCache, policy: CachePolicy):
+    """
+    Cache an async route handler's dict response according to a policy
+
+    Misses go through cache.get_or_fetch, so concurrent identical requests
+    share one upstream call and stale entries are revalidated in the
+    background. The response gets a "cached" flag.
 
+    Args:
+        cache: Cache instance to store responses in
+        policy: Key builder, TTLs and per-route size bound
+    """
+    if policy.max_entries is not None:
+        cache.set_namespace_limit(policy.namespace, policy.max_entries)
+
+    def decorator(func: Callable[..., Awaitable[Dict[str, Any]]]):
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Dict[str, Any]:
+            key = policy.build_key(**kwargs)
+            result, from_cache = await cache.get_or_fetch(
+                key,
+                lambda: func(*args, **kwargs),
+                ttl=policy.ttl,
+                hard_ttl=policy.hard_ttl,
+                negative_ttl=policy.negative_ttl,
+                is_negative=policy.is_negative,
+                is_cacheable=policy.is_cacheable,
+            )
+            if from_cache:
+                logger.info(f"✅ Returning cached response for key: {key}")
+            return {**result, "cached": from_cache}
+
+        return wrapper
+
+    return decorator
+
+
+# Optional persistent tier, enabled by pointing TMDB_CACHE_DB_PATH at a file
+TMDB_CACHE_DB_PATH = os.getenv("TMDB_CACHE_DB_PATH")
+TMDB_CACHE_WARM_ENTRIES = int(os.getenv("TMDB_CACHE_WARM_ENTRIES", 500))
+
+# Global cache instance
+tmdb_cache = SimpleCache(
+    default_ttl_minutes=10,
+    max_entries=int(os.getenv("TMDB_CACHE_MAX_ENTRIES", 1000)),
+    max_bytes=int(os.getenv("TMDB_CACHE_MAX_BYTES", 50 * 1024 * 1024)),
+    # Serve stale TMDB data for up to an hour while refreshing in the background
+    hard_ttl_minutes=int(os.getenv("TMDB_CACHE_HARD_TTL_MINUTES", 60)),
+    store=SQLiteCacheStore(TMDB_CACHE_DB_PATH) if TMDB_CACHE_DB_PATH else None,
+)
+TMDB_CACHE_SWEEP_INTERVAL = float(os.getenv("TMDB_CACHE_SWEEP_INTERVAL", 60))
@@ -0,0 +1,315 @@
+"""
+Columnar, memory-mapped catalogs for the recommendation datasets
+Each dataset is stored as NumPy columns plus an interned string table and
+persisted as .npy files, so every uvicorn worker maps the same pages
+instead of holding its own list of dicts
+"""
+
+import csv
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Where built catalogs are persisted; shared by all workers on the host
+CATALOG_DIR = Path(os.getenv("CATALOG_DIR", Path(tempfile.gettempdir()) / "recosys_catalog"))
+
+# Column kinds: "str" (code into the string table), "float", "int",
+# "str_list" (CSR offsets + codes into the string table)
+Schema = Dict[str, str]
+
+_MISSING = -1
+
+
+class StringTable:
+    """Interned UTF-8 strings stored as one byte blob plus offsets"""
+
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray):
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, code: int) -> str:
+        start, end = int(self.offsets[code]), int(self.offsets[code + 1])
+        return self.blob[start:end].tobytes().decode("utf-8")
+
+    @classmethod
+    def build(cls, strings: Sequence[str]) -> "StringTable":
+        encoded = [s.encode("utf-8") for s in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        blob = np.frombuffer(b"".join(encoded), dtype=np.uint8) if encoded else np.zeros(0, dtype=np.uint8)
+        return cls(blob, offsets)
+
+
+class ColumnarCatalog:
+    """Read-only catalog of items stored column by column"""
+
+    def __init__(self, schema: Schema, columns: Dict[str, np.ndarray], strings: StringTable):
+        self.schema = schema
+        self.columns = columns
+        self.strings = strings
+        first = next(iter(schema))
+        self._length = len(columns[first + "_offsets"]) - 1 if schema[first] == "str_list" else len(columns[first])
+
+    def __len__(self) -> int:
+        return self._length
+
+    def column(self, name: str) -> np.ndarray:
+        """Raw column array (string columns hold codes into the string table)"""
+        return self.columns[name]
+
+    def get(self, name: str, i: int) -> Any:
+        """Value of one field for item i, or None if the item doesn't have it"""
+        kind = self.schema[name]
+        if kind == "str":
+            code = int(self.columns[name][i])
+            return None if code == _MISSING else self.strings[code]
+        if kind == "float":
+            value = float(self.columns[name][i])
+            return None if np.isnan(value) else value
+        if kind == "int":
+            value = int(self.columns[name][i])
+            return None if value == _MISSING else value
+        offsets = self.columns[name + "_offsets"]
+        start, end = int(offsets[i]), int(offsets[i + 1])
+        return [self.strings[int(code)] for code in self.columns[name][start:end]]
+
+    def strings_of(self, name: str) -> List[str]:
+        """Decoded values of a string column ("" where missing)"""
+        return [self.get(name, i) or "" for i in range(len(self))]
+
+    def row(self, i: int) -> Dict[str, Any]:
+        """Rebuild item i as a dict with the original keys"""
+        row: Dict[str, Any] = {}
+        for name in self.schema:
+            value = self.get(name, i)
+            if value is not None:
+                row[name] = value
+        return row
+
+    def rows(self, indices: Optional[Sequence[int]] = None) -> List[Dict[str, Any]]:
+        """Rebuild several items (all when indices is None)"""
+        if indices is None:
+            indices = range(len(self))
+        return [self.row(int(i)) for i in indices]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self)):
+            yield self.row(i)
+
+    @classmethod
+    def from_records(cls, records: Sequence[Dict[str, Any]], schema: Schema) -> "ColumnarCatalog":
+        """
+        Build a catalog from a list of dicts
+
+        Args:
+            records: Items to store
+            schema: Field name -> column kind
+
+        Returns:
+            In-memory catalog (see save/load for the memory-mapped form)
+        """
+        interned: Dict[str, int] = {}
+
+        def intern(value: Any) -> int:
+            value = str(value)
+            code = interned.get(value)
+            if code is None:
+                code = interned[value] = len(interned)
+            return code
+
+        columns: Dict[str, np.ndarray] = {}
+        for name, kind in schema.items():
+            values = [record.get(name) for record in records]
+            if kind == "str":
+                columns[name] = np.array([_MISSING if v is None else intern(v) for v in values], dtype=np.int32)
+            elif kind == "float":
+                columns[name] = np.array([np.nan if v in (None, "") else float(v) for v in values], dtype=np.float64)
+            elif kind == "int":
+                columns[name] = np.array([_MISSING if v in (None, "") else int(v) for v in values], dtype=np.int64)
+            elif kind == "str_list":
+                offsets = np.zeros(len(values) + 1, dtype=np.int64)
+                codes: List[int] = []
+                for i, v in enumerate(values):
+                    codes.extend(intern(item) for item in (v or []))
+                    offsets[i + 1] = len(codes)
+                columns[name] = np.array(codes, dtype=np.int32)
+                columns[name + "_offsets"] = offsets
+            else:
+                raise ValueError(f"Unknown column kind '{kind}' for field '{name}'")
+
+        strings = StringTable.build(sorted(interned, key=interned.get))
+        return cls(schema, columns, strings)
+
+    def save(self, path: Path) -> None:
+        """Write the catalog as .npy files in a directory"""
+        path.mkdir(parents=True, exist_ok=True)
+        for name, array in self.columns.items():
+            np.save(path / f"col_{name}.npy", array)
+        np.save(path / "strings_blob.npy", self.strings.blob)
+        np.save(path / "strings_offsets.npy", self.strings.offsets)
+        (path / "meta.json").write_text(json.dumps({"schema": self.schema}))
+
+    @classmethod
+    def load(cls, path: Path) -> "ColumnarCatalog":
+        """Open a saved catalog with every array memory-mapped read-only"""
+        meta = json.loads((path / "meta.json").read_text())
+        schema = meta["schema"]
+        columns: Dict[str, np.ndarray] = {}
+        for name, kind in schema.items():
+            columns[name] = np.load(path / f"col_{name}.npy", mmap_mode="r")
+            if kind == "str_list":
+                columns[name + "_offsets"] = np.load(path / f"col_{name}_offsets.npy", mmap_mode="r")
+        strings = StringTable(
+            np.load(path / "strings_blob.npy", mmap_mode="r"),
+            np.load(path / "strings_offsets.npy", mmap_mode="r"),
+        )
+        return cls(schema, columns, strings)
+
+
+def records_from_file(path: Path) -> List[Dict[str, Any]]:
+    """Read a list of records from a .json (list of objects) or .csv file"""
+    if path.suffix.lower() == ".json":
+        return json.loads(path.read_text(encoding="utf-8"))
+    with path.open(newline="", encoding="utf-8") as f:
+        return [dict(row) for row in csv.DictReader(f)]
+
+
+def source_fingerprint(files: Sequence[Path], schema: Schema) -> str:
+    """
+    Fingerprint of a dataset's source files by path, size and mtime
+
+    Only stat()s the files, so a worker can find an existing build without
+    parsing the source. Touching or redeploying a file triggers a rebuild.
+    """
+    parts: List[Any] = [schema]
+    for path in files:
+        stat = path.stat()
+        parts.append([str(path.resolve()), stat.st_size, stat.st_mtime_ns])
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def build_or_load(
+    name: str,
+    load_records: Callable[[], Sequence[Dict[str, Any]]],
+    schema: Schema,
+    fingerprint: str,
+) -> ColumnarCatalog:
+    """
+    Memory-map a persisted catalog, building it first if the source changed
+
+    The directory name includes the source fingerprint, so stale builds
+    are never reused and records are only loaded when a build is needed.
+    Builds go to a temp directory and are renamed into place, which keeps
+    concurrent workers from reading partial files.
+
+    Args:
+        name: Dataset name
+        load_records: Returns the source items (only called to build)
+        schema: Field name -> column kind
+        fingerprint: Identifies the source version (see source_fingerprint)
+
+    Returns:
+        Memory-mapped catalog (in-memory if the catalog dir isn't writable)
+    """
+    target = CATALOG_DIR / f"{name}-{fingerprint}"
+    if (target / "meta.json").exists():
+        return ColumnarCatalog.load(target)
+
+    catalog = ColumnarCatalog.from_records(load_records(), schema)
+    try:
+        CATALOG_DIR.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=f".{name}-", dir=CATALOG_DIR))
+        catalog.save(staging)
+        try:
+            os.rename(staging, target)
+        except OSError:
+            # Another worker published the same build first
+            shutil.rmtree(staging, ignore_errors=True)
+        return ColumnarCatalog.load(target)
+    except OSError as e:
+        logger.warning(f"⚠️ Could not persist catalog '{name}' to {CATALOG_DIR}, keeping it in memory: {e}")
+        return catalog
+
+
+# Built-in datasets and their column layouts
+DATASET_SCHEMAS: Dict[str, Schema] = {
+    "movies": {"title": "str", "genre": "str", "rating": "float", "year": "int"},
+    "books": {"title": "str", "author": "str", "genre": "str", "rating": "float"},
+    "blogs": {"title": "str", "topic": "str", "tags": "str_list"},
+    "products": {"name": "str", "category": "str", "price": "float"},
+    "recommendations": {"id": "int", "title": "str", "category": "str", "description": "str"},
+}
+
+# Optional directory with <dataset>.json or <dataset>.csv overriding the built-in data
+CATALOG_SOURCE_DIR = os.getenv("CATALOG_SOURCE_DIR")
+
+_catalogs: Dict[str, ColumnarCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def _builtin_records(name: str) -> List[Dict[str, Any]]:
+    from data import recommendations as rec
+    from data.database import RECOMMENDATIONS
+    builtin = {
+        "movies": rec.movies,
+        "books": rec.books,
+        "blogs": rec.blogs,
+        "products": rec.products,
+        "recommendations": RECOMMENDATIONS,
+    }
+    return builtin[name]
+
+
+def _source(name: str) -> Tuple[List[Path], Callable[[], List[Dict[str, Any]]]]:
+    """Source files of a dataset and a loader for its records"""
+    if CATALOG_SOURCE_DIR:
+        for suffix in (".json", ".csv"):
+            path = Path(CATALOG_SOURCE_DIR) / f"{name}{suffix}"
+            if path.exists():
+                return [path], lambda: records_from_file(path)
+
+    # Located without importing, so an existing build is found without evaluating the data modules
+    files = [Path(importlib.util.find_spec(module).origin) for module in ("data.recommendations", "data.database")]
+    return files, lambda: _builtin_records(name)
+
+
+def get_catalog(name: str) -> ColumnarCatalog:
+    """
+    Get the memory-mapped catalog for a dataset, building it on first use
+
+    Args:
+        name: One of DATASET_SCHEMAS
+
+    Returns:
+        Shared read-only catalog
+    """
+    catalog = _catalogs.get(name)
+    if catalog is None:
+        with _catalogs_lock:
+            catalog = _catalogs.get(name)
+            if catalog is None:
+                files, load_records = _source(name)
+                schema = DATASET_SCHEMAS[name]
+                catalog = build_or_load(name, load_records, schema, source_fingerprint(files, schema))
+                _catalogs[name] = catalog
+    return catalog
+
+
+def reload_catalogs() -> None:
+    """Drop loaded catalogs so the next get_catalog rebuilds from source"""
+    with _catalogs_lock:
+        _catalogs.clear()
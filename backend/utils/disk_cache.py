@@ -0,0 +1,134 @@
+"""
+SQLite-backed persistent tier for SimpleCache
+Keeps cached API responses across restarts and redeploys
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Row shape shared with SimpleCache: (key, value, fresh_until, expires_at)
+# Timestamps are wall-clock epoch seconds so they survive a process restart
+StoredEntry = Tuple[str, Any, float, float]
+
+
+class SQLiteCacheStore:
+    """Key/value store with expiry metadata in a local SQLite file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                fresh_until REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_entries_updated ON cache_entries (updated_at)"
+        )
+
+    def get(self, key: str) -> Optional[StoredEntry]:
+        """
+        Read an entry that hasn't passed its hard expiry
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Stored entry or None if missing/expired
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT key, value, fresh_until, expires_at FROM cache_entries WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1]), row[2], row[3]
+
+    def set(self, key: str, value: Any, fresh_until: float, expires_at: float) -> None:
+        """
+        Write an entry, replacing any previous value
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value
+            fresh_until: Epoch seconds when the entry becomes stale
+            expires_at: Epoch seconds when the entry must be dropped
+        """
+        try:
+            payload = json.dumps(value)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"⚠️ Skipping disk cache write for '{key}': {e}")
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, fresh_until, expires_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, payload, fresh_until, expires_at, time.time()),
+            )
+
+    def delete(self, key: str) -> None:
+        """Delete a key from the store"""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        """Delete all entries"""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries")
+
+    def cleanup_expired(self) -> int:
+        """
+        Remove all entries past their hard expiry
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),))
+        return cursor.rowcount
+
+    def load_recent(self, limit: int) -> List[StoredEntry]:
+        """
+        Load the most recently written live entries, newest first
+
+        Args:
+            limit: Maximum number of entries to return
+
+        Returns:
+            List of stored entries
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value, fresh_until, expires_at FROM cache_entries "
+                "WHERE expires_at > ? ORDER BY updated_at DESC LIMIT ?",
+                (time.time(), limit),
+            ).fetchall()
+        return [(key, json.loads(value), fresh_until, expires_at) for key, value, fresh_until, expires_at in rows]
+
+    def count(self) -> int:
+        """Number of rows currently stored (including expired ones)"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the underlying connection"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,144 @@
+"""
+Shared pooled HTTP clients for outbound API calls
+One httpx.AsyncClient per upstream host, opened on startup and closed on shutdown
+"""
+
+import os
+import logging
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import httpx
+from dotenv import load_dotenv
+
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _env_bool(name: str, default: bool = False) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
+# Pool settings shared by every upstream client
+HTTP_MAX_CONNECTIONS = _env_int("HTTP_MAX_CONNECTIONS", 100)
+HTTP_MAX_KEEPALIVE_CONNECTIONS = _env_int("HTTP_MAX_KEEPALIVE_CONNECTIONS", 20)
+HTTP_KEEPALIVE_EXPIRY = _env_float("HTTP_KEEPALIVE_EXPIRY", 30.0)
+HTTP2_ENABLED = _env_bool("HTTP2_ENABLED", False)
+
+
+@dataclass(frozen=True)
+class UpstreamConfig:
+    """Connection settings for a single upstream host; requests use paths relative to base_url"""
+    name: str
+    base_url: str
+    timeout: float
+    connect_timeout: float = 5.0
+
+
+# Known upstream hosts; timeouts can be tuned per host via env
+UPSTREAMS: Dict[str, UpstreamConfig] = {
+    "tmdb": UpstreamConfig(
+        name="tmdb",
+        base_url="https://api.themoviedb.org/3",
+        timeout=_env_float("TMDB_TIMEOUT", 30.0),
+    ),
+    "google_books": UpstreamConfig(
+        name="google_books",
+        base_url="https://www.googleapis.com/books/v1",
+        timeout=_env_float("GOOGLE_BOOKS_TIMEOUT", 10.0),
+    ),
+    "fakestore": UpstreamConfig(
+        name="fakestore",
+        base_url="https://fakestoreapi.com",
+        timeout=_env_float("FAKESTORE_TIMEOUT", 10.0),
+    ),
+}
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class HTTPClientPool:
+    """Holds one long-lived AsyncClient per upstream so connections are reused"""
+
+    def __init__(self, upstreams: Dict[str, UpstreamConfig]):
+        self._upstreams = upstreams
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._http2 = HTTP2_ENABLED
+        if self._http2 and not _http2_available():
+            logger.warning("HTTP2_ENABLED is set but the 'h2' package is missing; using HTTP/1.1")
+            self._http2 = False
+
+    def _build_client(self, config: UpstreamConfig) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+        )
+        timeout = httpx.Timeout(config.timeout, connect=config.connect_timeout)
+        return httpx.AsyncClient(base_url=config.base_url, limits=limits, timeout=timeout, http2=self._http2)
+
+    async def startup(self) -> None:
+        """Open a client for every configured upstream"""
+        for name, config in self._upstreams.items():
+            if name not in self._clients:
+                self._clients[name] = self._build_client(config)
+        logger.info(f"🔌 Opened pooled HTTP clients: {', '.join(self._clients)} (http2={self._http2})")
+
+    async def shutdown(self) -> None:
+        """Close every open client and release pooled connections"""
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+        logger.info("🔌 Closed pooled HTTP clients")
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        """
+        Get the pooled client for an upstream
+
+        Args:
+            name: Upstream name (see UPSTREAMS)
+
+        Returns:
+            Shared AsyncClient; created on demand if startup has not run yet
+        """
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            config: Optional[UpstreamConfig] = self._upstreams.get(name)
+            if config is None:
+                raise KeyError(f"Unknown upstream: {name}")
+            client = self._build_client(config)
+            self._clients[name] = client
+        return client
+
+
+# Global client pool
+http_clients = HTTPClientPool(UPSTREAMS)
+
+
+def get_client(name: str) -> httpx.AsyncClient:
+    """Shortcut for http_clients.get(name)"""
+    return http_clients.get(name)
@@ -1,8 +1,12 @@
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional
-from jose import jwt, JWTError
+from typing import Any, Optional
+from jose import jwk, jwt, JWTError
 from dotenv import load_dotenv
+import hashlib
 import os
+import threading
+import time
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
@@ -11,6 +15,12 @@ load_dotenv()
 SECRET = os.getenv("JWT_SECRET", "dev-secret")
 ALGO = "HS256"
 EXPIRE_MINUTES = 60
+# Recently verified tokens kept per worker (0 disables the cache)
+JWT_CACHE_MAX_ENTRIES = int(os.getenv("JWT_CACHE_MAX_ENTRIES", 1024))
+# Build the HMAC key object once instead of on every decode
+JWT_PRECOMPUTED_KEY = os.getenv("JWT_PRECOMPUTED_KEY", "true").lower() in ("1", "true", "yes")
+
+_verify_key: Any = jwk.construct(SECRET, ALGO) if JWT_PRECOMPUTED_KEY else SECRET
 
 security = HTTPBearer()
 
@@ -24,11 +34,82 @@ def create_access_token(sub: str, expires_minutes: int = EXPIRE_MINUTES) -> str:
     return jwt.encode(payload, SECRET, algorithm=ALGO)
 
 
+class VerifiedTokenCache:
+    """
+    Bounded LRU of token hash -> verified claims
+
+    Entries are only served until the token's own exp, so a cache hit
+    never accepts a token jwt.decode would reject as expired.
+    """
+
+    def __init__(self, max_entries: int = JWT_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        """Claims of a previously verified, still unexpired token"""
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            claims, exp = entry
+            if exp <= time.time():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(claims)
+
+    def put(self, token: str, claims: dict) -> None:
+        """Remember verified claims; tokens without exp are not cached"""
+        exp = claims.get("exp")
+        if self.max_entries <= 0 or not isinstance(exp, (int, float)):
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (dict(claims), float(exp))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+token_cache = VerifiedTokenCache()
+
+
 def decode_token(token: str) -> Optional[dict]:
+    claims = token_cache.get(token)
+    if claims is not None:
+        return claims
     try:
-        return jwt.decode(token, SECRET, algorithms=[ALGO])
+        claims = jwt.decode(token, _verify_key, algorithms=[ALGO])
     except JWTError:
         return None
+    token_cache.put(token, claims)
+    return claims
 
 
 def require_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
@@ -0,0 +1,179 @@
+"""
+Aho-Corasick multi-keyword matcher
+Finds every keyword of a taxonomy in one pass over the text, so matching
+cost depends on the text length rather than on the number of keywords
+"""
+
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
+
+# (group, label) a keyword belongs to, e.g. ("genre", "sci-fi")
+Payload = Tuple[str, str]
+
+_VOWELS = frozenset("aeiou")
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum()
+
+
+def inflections(keyword: str) -> Set[str]:
+    """
+    Common English inflections of a keyword's last word
+
+    Plural, -ing, -er(s) and -ed, with a dropped final "e" (write -> writing),
+    y -> ies/ied (biography -> biographies) and a doubled final consonant
+    after a short vowel (shop -> shopping). Over-generated forms that are
+    not real words are harmless: they simply never occur in queries.
+    """
+    forms = {keyword + suffix for suffix in ("s", "es", "ing", "er", "ers", "ed")}
+    last, prev = keyword[-1], keyword[-2:-1]
+    if last == "e":
+        forms |= {keyword[:-1] + "ing", keyword + "r", keyword + "rs", keyword + "d"}
+    elif last == "y" and prev and prev not in _VOWELS:
+        forms |= {keyword[:-1] + "ies", keyword[:-1] + "ied"}
+    elif (
+        len(keyword) >= 3 and last.isalpha() and last not in _VOWELS and last not in "wxy"
+        and prev in _VOWELS and keyword[-3] not in _VOWELS
+    ):
+        forms |= {keyword + last + suffix for suffix in ("ing", "er", "ers", "ed")}
+    forms.discard(keyword)
+    return forms
+
+
+class KeywordMatcher:
+    """
+    Compiled automaton over keywords tagged with (group, label) payloads
+
+    Matches must start and end on word boundaries, so "read" matches
+    "read" but not "bread" or "already". Common inflections match their
+    keyword ("watch" matches "watching", "shop" matches "shoppers"), but
+    compounds don't ("book" doesn't match "bookworm").
+    """
+
+    def __init__(self, inflect: bool = True):
+        self.inflect = inflect
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Surface forms ending at each state (including those reached through fail links)
+        self._output: List[List[str]] = [[]]
+        # Surface form -> (payload, keyword it is a form of)
+        self._payloads: Dict[str, List[Tuple[Payload, str]]] = {}
+        self._built = True
+
+    @classmethod
+    def from_groups(cls, groups: Mapping[str, Mapping[str, Sequence[str]]], **kwargs) -> "KeywordMatcher":
+        """
+        Build a matcher from {group: {label: [keywords]}}
+
+        Returns:
+            Compiled matcher
+        """
+        matcher = cls(**kwargs)
+        for group, labels in groups.items():
+            for label, keywords in labels.items():
+                for keyword in keywords:
+                    matcher.add(keyword, (group, label))
+        matcher.build()
+        return matcher
+
+    def add(self, keyword: str, payload: Payload) -> None:
+        """Add a keyword (and its inflections); call build() before matching"""
+        keyword = keyword.lower()
+        if not keyword:
+            return
+        self._add_form(keyword, keyword, payload)
+        if self.inflect:
+            for form in inflections(keyword):
+                self._add_form(form, keyword, payload)
+
+    def _add_form(self, form: str, keyword: str, payload: Payload) -> None:
+        payloads = self._payloads.setdefault(form, [])
+        if (payload, keyword) not in payloads:
+            payloads.append((payload, keyword))
+        state = 0
+        for ch in form:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = nxt
+        if form not in self._output[state]:
+            self._output[state].append(form)
+        self._built = False
+
+    def build(self) -> None:
+        """Compute failure links breadth-first"""
+        queue = deque()
+        for state in self._goto[0].values():
+            self._fail[state] = 0
+            queue.append(state)
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._output[nxt] = self._output[nxt] + [
+                    kw for kw in self._output[self._fail[nxt]] if kw not in self._output[nxt]
+                ]
+        self._built = True
+
+    @staticmethod
+    def _at_boundary(text: str, start: int, end: int) -> bool:
+        if start > 0 and _is_word_char(text[start - 1]):
+            return False
+        return end == len(text) or not _is_word_char(text[end])
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        """
+        Yield (start, end, form) for every whole-word occurrence of a keyword or one of its inflections
+
+        Args:
+            text: Already lowercased text
+        """
+        if not self._built:
+            self.build()
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for form in output[state]:
+                start = i + 1 - len(form)
+                if self._at_boundary(text, start, i + 1):
+                    yield start, i + 1, form
+
+    def hits(self, text: str) -> Dict[str, Dict[str, Set[str]]]:
+        """
+        Distinct keywords found in the text, by group and label
+
+        Returns:
+            {group: {label: {matched keywords}}}
+        """
+        found: Dict[str, Dict[str, Set[str]]] = {}
+        for _, _, form in self.finditer((text or "").lower()):
+            for (group, label), keyword in self._payloads[form]:
+                found.setdefault(group, {}).setdefault(label, set()).add(keyword)
+        return found
+
+
+def best_label(hits: Dict[str, Dict[str, Set[str]]], group: str, labels: Iterable[str]) -> Optional[str]:
+    """
+    Label of a group with the most distinct keyword hits
+
+    Ties go to the label listed first, as with a sequential scan.
+    """
+    best, best_count = None, 0
+    group_hits = hits.get(group, {})
+    for label in labels:
+        count = len(group_hits.get(label, ()))
+        if count > best_count:
+            best, best_count = label, count
+    return best
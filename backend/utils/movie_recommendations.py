@@ -1,16 +1,33 @@
 from typing import List, Dict, Optional, Any
 import csv
+import os
+import threading
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
 
+from .search_index import InvertedIndex
+
+# Seconds between mtime checks of movies.csv
+RELOAD_CHECK_INTERVAL = float(os.getenv("MOVIES_RELOAD_CHECK_INTERVAL", 5))
+
+
+def _csv_path() -> Optional[Path]:
+    # Try local path first, then repo root fallback
+    csv_path = Path(__file__).parent.parent / 'movies.csv'
+    if not csv_path.exists():
+        csv_path = Path(__file__).parent.parent.parent / 'movies.csv'
+    if not csv_path.exists():
+        return None
+    return csv_path
+
+
 def load_movies() -> List[Dict[str, Any]]:
     """Load movies from CSV file without pandas."""
     rows: List[Dict[str, Any]] = []
     try:
-        # Try local path first, then repo root fallback
-        csv_path = Path(__file__).parent.parent / 'movies.csv'
-        if not csv_path.exists():
-            csv_path = Path(__file__).parent.parent.parent / 'movies.csv'
-        if not csv_path.exists():
+        csv_path = _csv_path()
+        if csv_path is None:
             return []
         with csv_path.open(newline='', encoding='utf-8') as f:
             reader = csv.DictReader(f)
@@ -25,32 +42,122 @@ def load_movies() -> List[Dict[str, Any]]:
         print(f"Error loading movies.csv: {str(e)}")
     return rows
 
+
+@dataclass
+class _CatalogSnapshot:
+    """Immutable column-oriented view of movies.csv"""
+    mtime: float = 0.0
+    titles: List[str] = field(default_factory=list)
+    genres: List[str] = field(default_factory=list)
+    descriptions: List[str] = field(default_factory=list)
+    titles_lower: List[str] = field(default_factory=list)
+    descriptions_lower: List[str] = field(default_factory=list)
+    genre_index: Dict[str, List[int]] = field(default_factory=dict)
+    # n-grams of the lowercased title and description, so substring queries only check candidates
+    text_index: InvertedIndex = field(default_factory=InvertedIndex)
+
+    def row(self, i: int) -> Dict[str, Any]:
+        """Response item for row i, built from the columns"""
+        title = self.titles[i]
+        # Add placeholder image/link expected by frontend
+        return {
+            'title': title,
+            'genre': self.genres[i],
+            'description': self.descriptions[i],
+            'image': f"https://api.lorem.space/image/movie?w=500&h=750&hash={hash(title)}",
+            'link': f"/movies/{title.lower().replace(' ', '-')}"
+        }
+
+
+def _build_snapshot(rows: List[Dict[str, Any]], mtime: float) -> _CatalogSnapshot:
+    snap = _CatalogSnapshot(mtime=mtime)
+    for i, row in enumerate(rows):
+        title, genre, description = row['title'], row['genre'], row['description']
+        snap.titles.append(title)
+        snap.genres.append(genre)
+        snap.descriptions.append(description)
+        snap.titles_lower.append(title.lower())
+        snap.descriptions_lower.append(description.lower())
+        snap.genre_index.setdefault(genre.lower(), []).append(i)
+        snap.text_index.add(i, f"{title.lower()}\n{description.lower()}")
+    return snap
+
+
+class MovieCatalog:
+    """movies.csv loaded once into memory, reloaded in the background when the file changes"""
+
+    def __init__(self):
+        self._snapshot: Optional[_CatalogSnapshot] = None
+        self._lock = threading.Lock()
+        self._reloading = False
+        self._last_check = 0.0
+
+    @staticmethod
+    def _mtime() -> float:
+        csv_path = _csv_path()
+        try:
+            return csv_path.stat().st_mtime if csv_path else 0.0
+        except OSError:
+            return 0.0
+
+    def _reload(self, mtime: float) -> None:
+        try:
+            self._snapshot = _build_snapshot(load_movies(), mtime)
+        finally:
+            self._reloading = False
+
+    def _check_for_changes(self) -> None:
+        now = time.monotonic()
+        if now - self._last_check < RELOAD_CHECK_INTERVAL:
+            return
+        self._last_check = now
+
+        mtime = self._mtime()
+        with self._lock:
+            if self._reloading or mtime == self._snapshot.mtime:
+                return
+            self._reloading = True
+        # Keep serving the current snapshot while the new one is built
+        threading.Thread(target=self._reload, args=(mtime,), daemon=True).start()
+
+    def snapshot(self) -> _CatalogSnapshot:
+        """Current catalog; the first call loads it synchronously"""
+        if self._snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    mtime = self._mtime()
+                    self._snapshot = _build_snapshot(load_movies(), mtime)
+                    self._last_check = time.monotonic()
+            return self._snapshot
+        self._check_for_changes()
+        return self._snapshot
+
+
+movie_catalog = MovieCatalog()
+
+
 def get_movie_recommendations(query: str, genre: Optional[str] = None) -> List[Dict[str, Any]]:
     """Get movie recommendations based on query and genre."""
-    movies = load_movies()
+    snap = movie_catalog.snapshot()
 
     # Filter by genre (case-insensitive)
     if genre:
-        filtered = [m for m in movies if m.get('genre', '').lower() == genre.lower()]
+        candidates = snap.genre_index.get(genre.lower(), [])
     else:
-        filtered = movies
+        candidates = range(len(snap.titles))
 
-    if not filtered:
+    if not candidates:
         return []
 
     # Placeholder relevance filtering by query (simple contains on title/description)
     q = (query or '').lower().strip()
     if q:
-        filtered = [m for m in filtered if q in m.get('title', '').lower() or q in m.get('description', '').lower()]
-
-    # Add placeholder image/link expected by frontend
-    recommendations: List[Dict[str, Any]] = []
-    for m in filtered:
-        title = m.get('title', '')
-        recommendations.append({
-            **m,
-            'image': f"https://api.lorem.space/image/movie?w=500&h=750&hash={hash(title)}",
-            'link': f"/movies/{title.lower().replace(' ', '-')}"
-        })
+        # Every row containing q is among these; the check below drops the rest
+        matched = snap.text_index.lookup(q)
+        candidates = sorted(matched) if not genre else [i for i in candidates if i in matched]
+        candidates = [
+            i for i in candidates
+            if q in snap.titles_lower[i] or q in snap.descriptions_lower[i]
+        ]
 
-    return recommendations
\ No newline at end of file
+    return [snap.row(i) for i in candidates]
@@ -0,0 +1,223 @@
+"""
+Vectorized preference scoring over the columnar catalogs
+Precomputes per-item genre ids and keyword bitsets once per catalog so a
+user's preferences are matched with NumPy bit operations instead of a
+per-item Python loop
+"""
+
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .catalog import ColumnarCatalog
+
+# Fields searched for preference keywords, and the fields that give an item its genre (first present wins)
+KEYWORD_FIELDS = ("title", "name", "author", "topic")
+GENRE_FIELDS = ("genre", "topic", "category")
+
+# Rejection-sampling rounds before falling back to enumerating every match
+_MAX_SAMPLING_ROUNDS = 8
+
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.int64)
+
+_rng = np.random.default_rng()
+
+
+def _bits_at(bits: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """Values (0/1) of a packed bitset at the given item positions"""
+    return (bits[positions >> 3] >> (7 - (positions & 7))) & 1
+
+
+@dataclass
+class CompiledPreferences:
+    """One user's preferences resolved against one catalog's bitsets"""
+    matched: np.ndarray
+    count: int
+    preferred: Optional[np.ndarray]
+    keyword_bits: List[np.ndarray]
+
+    @property
+    def max_weight(self) -> int:
+        return 1 + (self.preferred is not None) + len(self.keyword_bits)
+
+    def weights(self, positions: np.ndarray) -> np.ndarray:
+        """Sampling weight of each item position"""
+        w = np.ones(len(positions), dtype=np.float64)
+        if self.preferred is not None:
+            w += _bits_at(self.preferred, positions)
+        for bits in self.keyword_bits:
+            w += _bits_at(bits, positions)
+        return w
+
+
+class PreferenceIndex:
+    """Genre ids plus lazily-built genre and keyword bitsets for one catalog"""
+
+    def __init__(self, catalog: ColumnarCatalog, keywords: Iterable[str] = ()):
+        self.size = len(catalog)
+        self.genre_ids: Dict[str, int] = {}
+        self.genre_codes = np.empty(self.size, dtype=np.int32)
+        self._texts: List[str] = []
+        self._tags: List[frozenset] = []
+        has_tags = "tags" in catalog.schema
+
+        for i in range(self.size):
+            genre = ""
+            for name in GENRE_FIELDS:
+                if name in catalog.schema:
+                    genre = catalog.get(name, i) or ""
+                    if genre:
+                        break
+            genre = genre.lower()
+            self.genre_codes[i] = self.genre_ids.setdefault(genre, len(self.genre_ids))
+            self._texts.append(" ".join(
+                str(catalog.get(name, i) or "") if name in catalog.schema else "" for name in KEYWORD_FIELDS
+            ).lower())
+            self._tags.append(frozenset(t.lower() for t in catalog.get("tags", i)) if has_tags else frozenset())
+
+        # Packed bitsets (one bit per item), built on first use and then shared by every request
+        self.all_bits = np.packbits(np.ones(self.size, dtype=bool))
+        self._genre_bits: Dict[str, np.ndarray] = {}
+        self._keyword_bits: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+        for keyword in keywords:
+            self.keyword_bits(keyword)
+
+    def genre_bits(self, genre: str) -> Optional[np.ndarray]:
+        """Packed bitset of items in a genre (None if no item has it)"""
+        genre = genre.lower()
+        if genre not in self.genre_ids:
+            return None
+        bits = self._genre_bits.get(genre)
+        if bits is None:
+            bits = np.packbits(self.genre_codes == self.genre_ids[genre])
+            with self._lock:
+                self._genre_bits[genre] = bits
+        return bits
+
+    def keyword_bits(self, keyword: str) -> np.ndarray:
+        """Packed bitset of items whose text contains the keyword or that carry it as a tag"""
+        keyword = keyword.lower()
+        bits = self._keyword_bits.get(keyword)
+        if bits is None:
+            mask = np.fromiter(
+                (keyword in text or keyword in tags for text, tags in zip(self._texts, self._tags)),
+                dtype=bool, count=self.size,
+            )
+            bits = np.packbits(mask)
+            with self._lock:
+                self._keyword_bits[keyword] = bits
+        return bits
+
+    def compile(self, genres: Iterable[str], keywords: Iterable[str]) -> CompiledPreferences:
+        """
+        Combine a user's genre and keyword bitsets into ready-to-sample form
+
+        An item matches if its genre is preferred or any keyword matches;
+        an empty genre or keyword preference matches everything.
+        """
+        genres = list(genres)
+        genre_bits = [bits for bits in (self.genre_bits(g) for g in genres) if bits is not None]
+        keyword_bits = [self.keyword_bits(kw) for kw in keywords]
+        if not genres or not keyword_bits:
+            matched = self.all_bits
+        else:
+            matched = np.bitwise_or.reduce(keyword_bits + genre_bits)
+        return CompiledPreferences(
+            matched=matched,
+            count=int(_POPCOUNT[matched].sum()),
+            preferred=np.bitwise_or.reduce(genre_bits) if genre_bits else None,
+            keyword_bits=keyword_bits,
+        )
+
+    def sample(self, prefs: CompiledPreferences, k: int) -> np.ndarray:
+        """
+        Draw up to k matching items, weighted by how well they match
+
+        Weight is 1, plus 1 for a preferred genre, plus 1 per matching
+        keyword. Items are drawn without replacement proportionally to weight.
+
+        Returns:
+            Item positions, best draw first (empty if nothing matches)
+        """
+        if prefs.count == 0:
+            return np.zeros(0, dtype=np.int64)
+
+        # Draws needed to collect k items by rejection; only worth it while that beats enumerating every match
+        if k < prefs.count and k * prefs.max_weight * self.size / prefs.count < prefs.count:
+            picked = self._rejection_sample(prefs, k)
+            if picked is not None:
+                return picked
+
+        positions = np.flatnonzero(np.unpackbits(prefs.matched, count=self.size))
+        return weighted_sample(positions, prefs.weights(positions), k)
+
+    def _rejection_sample(self, prefs: CompiledPreferences, k: int) -> Optional[np.ndarray]:
+        """
+        Sequential weighted draws without enumerating the matches
+
+        Uniform positions are accepted if they match, then with probability
+        weight / max_weight; repeats are skipped, which yields the same
+        distribution as weighted sampling without replacement.
+        """
+        chosen: List[int] = []
+        seen = set()
+        for _ in range(_MAX_SAMPLING_ROUNDS):
+            needed = k - len(chosen)
+            draws = int(needed * prefs.max_weight * self.size / prefs.count * 1.5) + 8
+            positions = _rng.integers(0, self.size, draws)
+            positions = positions[_bits_at(prefs.matched, positions) == 1]
+            positions = positions[_rng.random(len(positions)) * prefs.max_weight < prefs.weights(positions)]
+            for p in positions.tolist():
+                if p not in seen:
+                    seen.add(p)
+                    chosen.append(p)
+                    if len(chosen) == k:
+                        return np.array(chosen, dtype=np.int64)
+        return None
+
+
+def weighted_sample(indices: np.ndarray, weights: Optional[np.ndarray], k: int) -> np.ndarray:
+    """
+    Draw k distinct indices with probability proportional to weight
+
+    Uses the Efraimidis-Spirakis keys u^(1/w) and a partial sort, so it
+    is linear in the number of candidates.
+    """
+    if len(indices) <= k:
+        if weights is None:
+            return _rng.permutation(indices)
+        k = len(indices)
+    if weights is None:
+        return _rng.choice(indices, size=k, replace=False)
+    keys = _rng.random(len(indices)) ** (1.0 / weights)
+    top = np.argpartition(-keys, k - 1)[:k]
+    return indices[top[np.argsort(-keys[top])]]
+
+
+_indexes: "weakref.WeakKeyDictionary[ColumnarCatalog, PreferenceIndex]" = weakref.WeakKeyDictionary()
+_indexes_lock = threading.Lock()
+
+
+def get_preference_index(catalog: ColumnarCatalog, keywords: Iterable[str] = ()) -> PreferenceIndex:
+    """
+    Preference index for a catalog, built on first use
+
+    Args:
+        catalog: Catalog to index (a reloaded catalog gets a fresh index)
+        keywords: Keywords to precompute bitsets for when building
+
+    Returns:
+        Shared index
+    """
+    index = _indexes.get(catalog)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.get(catalog)
+            if index is None:
+                index = PreferenceIndex(catalog, keywords)
+                _indexes[catalog] = index
+    return index
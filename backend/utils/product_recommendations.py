@@ -1,7 +1,7 @@
-import httpx
 import asyncio
 from typing import List, Dict, Any, Optional
 import logging
+from .http_client import get_client
 
 logger = logging.getLogger(__name__)
 
@@ -22,15 +22,15 @@ async def fetch_products_from_fake_api(query: str, max_results: int = 5) -> List
 
         if category:
             # Fetch specific category
-            url = f"https://fakestoreapi.com/products/category/{category}"
+            url = f"/products/category/{category}"
         else:
             # Fetch all products
-            url = "https://fakestoreapi.com/products"
+            url = "/products"
 
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(url)
-            response.raise_for_status()
-            products_data = response.json()
+        client = get_client("fakestore")
+        response = await client.get(url)
+        response.raise_for_status()
+        products_data = response.json()
 
         # If we got all products but have a category, filter them
         if not category and query.strip():
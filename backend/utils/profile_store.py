@@ -0,0 +1,97 @@
+"""
+User preference profiles for personalized recommendations
+Indexes profiles by case-folded username and keeps each profile's
+preferences compiled against every catalog it has been scored on
+"""
+
+import threading
+import weakref
+from collections import Counter
+from typing import Any, Dict, FrozenSet, Iterable, Optional
+
+from data.users import users
+
+from .preference_scoring import CompiledPreferences, PreferenceIndex
+
+
+def username_key(username: str) -> str:
+    """Canonical form used for username lookups"""
+    return (username or "").strip().casefold()
+
+
+class UserProfile:
+    """A user's normalized preferences plus their per-catalog compiled form"""
+
+    def __init__(self, username: str, preferences: Optional[Dict[str, Any]] = None):
+        self.username = username
+        self.preferences = dict(preferences or {})
+        self.genres = frozenset(g.lower() for g in (self.preferences.get("genres") or []))
+        self.keywords = frozenset(kw.lower() for kw in (self.preferences.get("keywords") or []))
+        self._compiled: "weakref.WeakKeyDictionary[PreferenceIndex, CompiledPreferences]" = weakref.WeakKeyDictionary()
+
+    def compiled_for(self, index: PreferenceIndex) -> CompiledPreferences:
+        """Preferences resolved against a catalog's index, compiled on first use"""
+        compiled = self._compiled.get(index)
+        if compiled is None:
+            compiled = index.compile(self.genres, self.keywords)
+            self._compiled[index] = compiled
+        return compiled
+
+
+class ProfileStore:
+    """Username -> UserProfile; replacing a profile drops its compiled preferences"""
+
+    def __init__(self, seed: Iterable[Dict[str, Any]] = ()):
+        self._lock = threading.Lock()
+        self._profiles: Dict[str, UserProfile] = {}
+        # Keyword -> number of profiles preferring it; the set view is rebuilt only when membership changes
+        self._keyword_counts: "Counter[str]" = Counter()
+        self._keywords: Optional[FrozenSet[str]] = None
+        for user in seed:
+            self._put(UserProfile(user["username"], user.get("preferences")))
+
+    def _put(self, profile: Optional[UserProfile], username: Optional[str] = None) -> None:
+        """Replace (or with profile=None remove) a profile and update keyword counts; caller holds the lock"""
+        key = username_key(profile.username if profile is not None else username)
+        old = self._profiles.pop(key, None)
+        changed = False
+        if old is not None:
+            for kw in old.keywords:
+                self._keyword_counts[kw] -= 1
+                if self._keyword_counts[kw] == 0:
+                    del self._keyword_counts[kw]
+                    changed = True
+        if profile is not None:
+            self._profiles[key] = profile
+            for kw in profile.keywords:
+                changed |= kw not in self._keyword_counts
+                self._keyword_counts[kw] += 1
+        if changed:
+            self._keywords = None
+
+    def get(self, username: str) -> Optional[UserProfile]:
+        """Profile for a username (case-insensitive), if any"""
+        return self._profiles.get(username_key(username))
+
+    def upsert(self, username: str, preferences: Dict[str, Any]) -> UserProfile:
+        """Create or replace a user's preferences"""
+        profile = UserProfile(username, preferences)
+        with self._lock:
+            self._put(profile)
+        return profile
+
+    def remove(self, username: str) -> None:
+        """Forget a user's profile"""
+        with self._lock:
+            self._put(None, username)
+
+    def keywords(self) -> FrozenSet[str]:
+        """Every keyword any profile prefers (prebuilt when a catalog is indexed)"""
+        keywords = self._keywords
+        if keywords is None:
+            with self._lock:
+                keywords = self._keywords = frozenset(self._keyword_counts)
+        return keywords
+
+
+profile_store = ProfileStore(seed=users)
@@ -0,0 +1,223 @@
+"""
+Query understanding pipeline shared by the recommendation endpoints
+Tokenizes a query once and derives the normalized text, search terms and
+detected content type / category / genre from that single pass; results
+for repeated queries come from a bounded LRU memo
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from .keyword_matcher import KeywordMatcher, best_label
+from .search_index import normalize_query
+from .text_analysis import CATEGORY_KEYWORDS, GENRE_KEYWORDS, EXCLUDED_TERMS
+
+# Filler words to remove from queries (excluding genre terms)
+FILLER_WORDS = frozenset({
+    'show', 'me', 'some', 'recommend', 'movies', 'movie', 'films', 'film', 'want', 'like', 'suggest',
+    'please', 'can', 'you', 'find', 'get', 'give', 'tell', 'about', 'a', 'an', 'the', 'good', 'best',
+    'top', 'great', 'awesome', 'amazing', 'wonderful', 'fantastic', 'excellent', 'perfect', 'nice',
+    'cool', 'interesting', 'fun', 'exciting', 'thrilling', 'action', 'packed', 'full', 'of', 'with',
+    'that', 'are', 'is', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had', 'do', 'does',
+    'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'shall', 'let', 'lets',
+    'let\'s', 'i', 'we', 'they', 'he', 'she', 'it', 'this', 'that', 'these', 'those', 'my', 'your',
+    'his', 'her', 'its', 'our', 'their', 'what', 'which', 'who', 'when', 'where', 'why', 'how',
+    'all', 'any', 'both', 'each', 'few', 'many', 'most', 'other', 'some', 'such', 'no', 'nor',
+    'not', 'only', 'own', 'same', 'so', 'than', 'too', 'very', 'just', 'also', 'even', 'ever',
+    'never', 'here', 'there', 'now', 'then', 'once', 'always', 'sometimes', 'often', 'usually',
+    'rarely', 'seldom', 'again', 'still', 'yet', 'already', 'soon', 'later', 'before', 'after',
+    'since', 'until', 'while', 'during', 'through', 'across', 'against', 'among', 'between',
+    'into', 'onto', 'upon', 'under', 'over', 'above', 'below', 'behind', 'beside', 'near', 'by',
+    'from', 'to', 'at', 'in', 'on', 'for', 'as', 'with', 'about', 'like', 'through', 'during',
+    'before', 'after', 'above', 'below', 'between', 'among', 'inside', 'outside', 'beside',
+    'behind', 'beyond', 'near', 'far', 'close', 'open', 'full', 'empty', 'hot', 'cold', 'wet',
+    'dry', 'big', 'small', 'large', 'little', 'long', 'short', 'high', 'low', 'wide', 'narrow',
+    'thick', 'thin', 'heavy', 'light', 'hard', 'soft', 'fast', 'slow', 'easy', 'difficult',
+    'simple', 'complex', 'new', 'old', 'young', 'fresh', 'clean', 'dirty', 'right', 'wrong',
+    'true', 'false', 'real', 'fake', 'good', 'bad', 'better', 'best', 'worse', 'worst', 'more',
+    'most', 'less', 'least', 'first', 'last', 'next', 'previous', 'early', 'late', 'soon',
+    'later', 'now', 'then', 'here', 'there', 'everywhere', 'nowhere', 'anywhere', 'somewhere',
+    'every', 'all', 'both', 'neither', 'either', 'none', 'any', 'some', 'many', 'much', 'few',
+    'little', 'several', 'enough', 'plenty', 'lot', 'lots', 'bit', 'piece', 'part', 'whole',
+    'half', 'quarter', 'third', 'everything', 'nothing', 'anything', 'something', 'everyone',
+    'noone', 'anyone', 'someone', 'everybody', 'nobody', 'anybody', 'somebody', 'everything',
+    'nothing', 'anything', 'something', 'everywhere', 'nowhere', 'anywhere', 'somewhere'
+})
+
+# Genre terms to preserve (not remove as filler)
+GENRE_TERMS = frozenset({
+    'sci-fi', 'science', 'fiction', 'horror', 'thriller', 'comedy', 'drama', 'action', 'adventure',
+    'romance', 'mystery', 'fantasy', 'animation', 'documentary', 'biography', 'crime', 'western',
+    'musical', 'war', 'history', 'family', 'sport', 'music', 'reality', 'talk', 'news', 'game'
+})
+
+# Content type keywords
+CONTENT_TYPE_KEYWORDS = {
+    "books": ["book", "books", "read", "reading", "novel", "author", "literature"],
+    "products": ["product", "products", "buy", "shop", "gadget", "item", "purchase"],
+    "blogs": ["blog", "blogs", "article", "post", "tech", "lifestyle", "news"]
+}
+
+# Genre terms that suggest books when no content type keyword is present
+BOOK_GENRE_HINTS = ('thriller', 'mystery', 'romance', 'fantasy', 'biography')
+
+# Every keyword group compiled into one automaton; one pass over the query finds all hits
+QUERY_MATCHER = KeywordMatcher.from_groups({
+    "content_type": CONTENT_TYPE_KEYWORDS,
+    "genre_hint": {"books": BOOK_GENRE_HINTS},
+    "category": CATEGORY_KEYWORDS,
+    "genre": GENRE_KEYWORDS,
+})
+
+# Distinct queries whose analysis is memoized per worker (0 disables the memo)
+QUERY_MEMO_MAX_ENTRIES = int(os.getenv("QUERY_MEMO_MAX_ENTRIES", 4096))
+
+
+@dataclass(frozen=True)
+class ParsedQuery:
+    """Everything the recommendation endpoints derive from a raw query"""
+    raw: str
+    # Lowercased, hyphens/underscores as spaces, whitespace collapsed
+    normalized: str
+    # Lowercased whitespace-separated words
+    tokens: Tuple[str, ...]
+    # Tokens without filler words (genre terms kept); "" if nothing is left
+    search_term: str
+    # Tokens without category/genre keywords; the raw query if nothing is left
+    search_terms: str
+    # movies, books, products or blogs
+    content_type: str
+    category: Optional[str]
+    genre: Optional[str]
+
+
+def _content_type(hits) -> str:
+    # Specific content type keywords, in priority order
+    for content_type in CONTENT_TYPE_KEYWORDS:
+        if content_type in hits.get("content_type", {}):
+            return content_type
+    # Genre terms that might indicate books
+    if hits.get("genre_hint"):
+        return "books"
+    return "movies"  # default
+
+
+@dataclass(frozen=True)
+class _Analysis:
+    """The parts of a ParsedQuery that depend only on the lowercased tokens"""
+    normalized: str
+    tokens: Tuple[str, ...]
+    search_term: str
+    search_terms: str
+    content_type: str
+    category: Optional[str]
+    genre: Optional[str]
+
+
+class QueryMemo:
+    """Bounded LRU of query analyses keyed by the lowercased, whitespace-collapsed query"""
+
+    def __init__(self, max_entries: int = QUERY_MEMO_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, _Analysis]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[_Analysis]:
+        with self._lock:
+            analysis = self._entries.get(key)
+            if analysis is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return analysis
+
+    def put(self, key: str, analysis: _Analysis) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = analysis
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Entry count and hit/miss/eviction counters"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+query_memo = QueryMemo()
+
+
+def _analyze(tokens: Tuple[str, ...], lowered: str, exclude_words: Iterable[str] = ()) -> _Analysis:
+    normalized = normalize_query(lowered)
+    hits = QUERY_MATCHER.hits(lowered)
+
+    filtered = [t for t in tokens if (t not in FILLER_WORDS or t in GENRE_TERMS) and len(t) > 1]
+    excluded = EXCLUDED_TERMS.union(exclude_words) if exclude_words else EXCLUDED_TERMS
+    terms = [t for t in tokens if t not in excluded]
+
+    return _Analysis(
+        normalized=normalized,
+        tokens=tokens,
+        search_term=" ".join(filtered),
+        search_terms=" ".join(terms),
+        content_type=_content_type(hits),
+        category=best_label(hits, "category", CATEGORY_KEYWORDS),
+        genre=best_label(hits, "genre", GENRE_KEYWORDS),
+    )
+
+
+def parse_query(query: str, exclude_words: Iterable[str] = ()) -> ParsedQuery:
+    """
+    Parse a free-form query, reusing the memoized analysis of repeat queries
+
+    Args:
+        query: Raw user query
+        exclude_words: Extra words to drop from search_terms (bypasses the memo)
+
+    Returns:
+        Parsed query
+    """
+    query = query or ""
+    tokens = tuple(query.lower().split())
+    lowered = " ".join(tokens)
+
+    if exclude_words:
+        analysis = _analyze(tokens, lowered, exclude_words)
+    else:
+        analysis = query_memo.get(lowered)
+        if analysis is None:
+            analysis = _analyze(tokens, lowered)
+            query_memo.put(lowered, analysis)
+
+    return ParsedQuery(
+        raw=query,
+        normalized=analysis.normalized,
+        tokens=analysis.tokens,
+        search_term=analysis.search_term,
+        search_terms=analysis.search_terms or query,
+        content_type=analysis.content_type,
+        category=analysis.category,
+        genre=analysis.genre,
+    )
+
@@ -1,13 +1,18 @@
 import os
 from typing import List, Dict, Any, Optional
-import httpx
 import asyncio
 from dotenv import load_dotenv
-from .text_analysis import detect_category_and_genre, extract_search_terms, get_tmdb_genre_id
+from .http_client import get_client
+from .query_pipeline import parse_query
+from .text_analysis import get_tmdb_genre_id
 
 # Load environment variables
 load_dotenv()
 
+# Per-call budget for these searches: httpx's 5s default they had before the
+# shared clients, whose own defaults are TMDB_TIMEOUT / GOOGLE_BOOKS_TIMEOUT / FAKESTORE_TIMEOUT
+SEARCH_TIMEOUT = 5.0
+
 class RecommendationResult:
     def __init__(self, title: str, description: str, image: str, link: str):
         self.title = title
@@ -29,7 +34,6 @@ async def search_tmdb_movies(query: str, genre: Optional[str] = None) -> List[Re
     if not api_key:
         raise ValueError("TMDB_API_KEY not found in environment variables")
 
-    base_url = "https://api.themoviedb.org/3"
     params = {
         "api_key": api_key,
         "query": query,
@@ -43,21 +47,21 @@ async def search_tmdb_movies(query: str, genre: Optional[str] = None) -> List[Re
             params["with_genres"] = genre_id
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{base_url}/search/movie", params=params)
-            response.raise_for_status()
-            data = response.json()
+        client = get_client("tmdb")
+        response = await client.get("/search/movie", params=params, timeout=SEARCH_TIMEOUT)
+        response.raise_for_status()
+        data = response.json()
 
-            results = []
-            for movie in data.get("results", [])[:5]:
-                if movie.get("poster_path"):
-                    results.append(RecommendationResult(
-                        title=movie["title"],
-                        description=movie["overview"],
-                        image=f"https://image.tmdb.org/t/p/w500{movie['poster_path']}",
-                        link=f"https://www.themoviedb.org/movie/{movie['id']}"
-                    ))
-            return results
+        results = []
+        for movie in data.get("results", [])[:5]:
+            if movie.get("poster_path"):
+                results.append(RecommendationResult(
+                    title=movie["title"],
+                    description=movie["overview"],
+                    image=f"https://image.tmdb.org/t/p/w500{movie['poster_path']}",
+                    link=f"https://www.themoviedb.org/movie/{movie['id']}"
+                ))
+        return results
     except Exception as e:
         print(f"TMDB API Error: {str(e)}")
         return []
@@ -65,49 +69,48 @@ async def search_tmdb_movies(query: str, genre: Optional[str] = None) -> List[Re
 async def search_google_books(query: str, genre: Optional[str] = None) -> List[RecommendationResult]:
     """Search for books using Google Books API."""
     search_query = f"{query} {genre}" if genre else query
-    url = f"https://www.googleapis.com/books/v1/volumes"
+    url = "/volumes"
     params = {"q": search_query, "maxResults": 5}
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
+        client = get_client("google_books")
+        response = await client.get(url, params=params, timeout=SEARCH_TIMEOUT)
+        response.raise_for_status()
+        data = response.json()
 
-            results = []
-            for book in data.get("items", []):
-                volume_info = book["volumeInfo"]
-                results.append(RecommendationResult(
-                    title=volume_info.get("title", ""),
-                    description=volume_info.get("description", "No description available")[:200] + "...",
-                    image=volume_info.get("imageLinks", {}).get("thumbnail", ""),
-                    link=volume_info.get("previewLink", "")
-                ))
-            return results
+        results = []
+        for book in data.get("items", []):
+            volume_info = book["volumeInfo"]
+            results.append(RecommendationResult(
+                title=volume_info.get("title", ""),
+                description=volume_info.get("description", "No description available")[:200] + "...",
+                image=volume_info.get("imageLinks", {}).get("thumbnail", ""),
+                link=volume_info.get("previewLink", "")
+            ))
+        return results
     except Exception as e:
         print(f"Google Books API Error: {str(e)}")
         return []
 
 async def search_products(query: str, category: Optional[str] = None) -> List[RecommendationResult]:
     """Search for products using FakeStore API."""
-    base_url = "https://fakestoreapi.com/products"
-    url = f"{base_url}/category/{category}" if category else base_url
+    url = f"/products/category/{category}" if category else "/products"
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url)
-            response.raise_for_status()
-            products = response.json()
+        client = get_client("fakestore")
+        response = await client.get(url, timeout=SEARCH_TIMEOUT)
+        response.raise_for_status()
+        products = response.json()
 
-            results = []
-            for product in products[:5]:
-                results.append(RecommendationResult(
-                    title=product["title"],
-                    description=product["description"],
-                    image=product["image"],
-                    link=f"https://fakestoreapi.com/products/{product['id']}"
-                ))
-            return results
+        results = []
+        for product in products[:5]:
+            results.append(RecommendationResult(
+                title=product["title"],
+                description=product["description"],
+                image=product["image"],
+                link=f"https://fakestoreapi.com/products/{product['id']}"
+            ))
+        return results
     except Exception as e:
         print(f"FakeStore API Error: {str(e)}")
         return []
@@ -141,9 +144,10 @@ async def get_recommendations(query: str) -> Dict[str, Any]:
     Main recommendation function that processes the query and returns recommendations.
     """
     try:
-        # Detect category and genre from query
-        category, genre = detect_category_and_genre(query)
-        search_terms = extract_search_terms(query)
+        # Detect category and genre and extract search terms in one pass
+        parsed = parse_query(query)
+        category, genre = parsed.category, parsed.genre
+        search_terms = parsed.search_terms
 
         # If no category detected, try multiple categories
         if not category:
@@ -0,0 +1,130 @@
+"""
+Inverted index for searching the static recommendation catalogs
+Built once per dataset; queries are answered from posting lists instead of scanning every item
+"""
+
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Set
+
+
+def normalize_query(query: str) -> str:
+    """Normalize query by lowercasing, replacing hyphens/underscores with spaces, and collapsing whitespace."""
+    if not query:
+        return ""
+    normalized = query.lower().replace("-", " ").replace("_", " ")
+    return " ".join(normalized.split())
+
+
+class InvertedIndex:
+    """
+    Character n-gram -> posting list (set of document ids)
+
+    Every 1- to 3-character substring of a text is indexed, so a document
+    containing a fragment anywhere (even mid-word or across a space) also
+    contains all of the fragment's n-grams. Lookups therefore return a
+    superset of the substring matches; callers still run the substring check.
+    """
+
+    GRAM_SIZE = 3
+
+    def __init__(self):
+        self._postings: Dict[str, Set[int]] = defaultdict(set)
+        self._doc_ids: Set[int] = set()
+
+    @classmethod
+    def _grams(cls, fragment: str) -> Set[str]:
+        n = cls.GRAM_SIZE
+        if len(fragment) <= n:
+            return {fragment}
+        return {fragment[i:i + n] for i in range(len(fragment) - n + 1)}
+
+    def add(self, doc_id: int, text: str) -> None:
+        """Index every 1- to 3-character substring of text under doc_id"""
+        self._doc_ids.add(doc_id)
+        for n in range(1, self.GRAM_SIZE + 1):
+            for i in range(len(text) - n + 1):
+                self._postings[text[i:i + n]].add(doc_id)
+
+    def lookup(self, fragment: str) -> Set[int]:
+        """Documents that may contain fragment (never misses one that does)"""
+        if not fragment:
+            return set(self._doc_ids)
+        postings = sorted((self._postings.get(gram, set()) for gram in self._grams(fragment)), key=len)
+        result = set(postings[0])
+        for posting in postings[1:]:
+            result &= posting
+            if not result:
+                break
+        return result
+
+    def match_all(self, fragments: Iterable[str]) -> Set[int]:
+        """Documents that may contain every fragment, smallest posting list first"""
+        postings = sorted((self.lookup(fragment) for fragment in set(fragments)), key=len)
+        if not postings:
+            return set()
+        result = set(postings[0])
+        for posting in postings[1:]:
+            result &= posting
+            if not result:
+                break
+        return result
+
+    def match_any(self, fragments: Iterable[str]) -> Set[int]:
+        """Documents that may contain at least one fragment"""
+        result: Set[int] = set()
+        for fragment in set(fragments):
+            result |= self.lookup(fragment)
+        return result
+
+
+class CatalogIndex:
+    """Pre-normalized searchable fields and an index for one content type"""
+
+    def __init__(self, make_row: Callable[[int], Dict[str, Any]], fields: Sequence[Sequence[str]]):
+        """
+        Args:
+            make_row: Builds the response item for a catalog position
+            fields: Raw searchable field values for each catalog entry
+        """
+        self.make_row = make_row
+        self.fields = [tuple(normalize_query(str(value)) for value in item_fields) for item_fields in fields]
+        self.index = InvertedIndex()
+        for doc_id, item_fields in enumerate(self.fields):
+            for value in item_fields:
+                self.index.add(doc_id, value)
+
+    def __len__(self) -> int:
+        return len(self.fields)
+
+    def _rows(self, doc_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        return [self.make_row(doc_id) for doc_id in sorted(doc_ids)]
+
+    def all(self) -> List[Dict[str, Any]]:
+        """Every item, in catalog order"""
+        return [self.make_row(doc_id) for doc_id in range(len(self))]
+
+    def search_phrase(self, normalized_query: str) -> List[Dict[str, Any]]:
+        """
+        Items where the whole query appears in a single field
+
+        Candidates come from the n-gram index; the substring check only runs
+        on those candidates.
+        """
+        if not normalized_query:
+            return self.all()
+        candidates = self.index.lookup(normalized_query)
+        return self._rows(
+            doc_id for doc_id in candidates
+            if any(normalized_query in value for value in self.fields[doc_id])
+        )
+
+    def search_any_word(self, normalized_query: str) -> List[Dict[str, Any]]:
+        """Items where at least one query word appears in any field"""
+        if not normalized_query:
+            return self.all()
+        words = normalized_query.split()
+        candidates = self.index.match_any(words)
+        return self._rows(
+            doc_id for doc_id in candidates
+            if any(word in value for word in words for value in self.fields[doc_id])
+        )
@@ -1,12 +1,188 @@
+"""
+Password hashing with a salted KDF (scrypt or PBKDF2 from hashlib)
+Hashing runs in a bounded thread pool so async endpoints don't block the event loop
+"""
+
+import asyncio
+import base64
 import hashlib
+import hmac
+import os
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
-def hash_password(password: str) -> str:
-    """Return a sha256 hash for a plain password (demo only)."""
-    if password is None:
-        password = ""
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# "scrypt" or "pbkdf2_sha256"
+PASSWORD_HASH_ALGORITHM = os.getenv("PASSWORD_HASH_ALGORITHM", "scrypt")
+# scrypt cost: N (CPU/memory, power of two), r (block size), p (parallelism)
+SCRYPT_N = int(os.getenv("SCRYPT_N", 2 ** 14))
+SCRYPT_R = int(os.getenv("SCRYPT_R", 8))
+SCRYPT_P = int(os.getenv("SCRYPT_P", 1))
+PBKDF2_ITERATIONS = int(os.getenv("PBKDF2_ITERATIONS", 600_000))
+# Concurrent hashes per worker; extra logins queue instead of oversubscribing the CPU
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 1))
+
+_SALT_BYTES = 16
+_KEY_BYTES = 32
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.b64decode(data.encode("ascii"))
+
+
+def _legacy_sha256(password: str) -> str:
     return hashlib.sha256(password.encode("utf-8")).hexdigest()
 
 
+class PasswordHasher:
+    """
+    Hashes and verifies passwords, encoding the algorithm and cost in each hash
+
+    Stored formats:
+        scrypt$<n>$<r>$<p>$<salt>$<key>
+        pbkdf2_sha256$<iterations>$<salt>$<key>
+        <64 hex chars> (legacy unsalted sha256, verify-only)
+
+    hashlib's scrypt and pbkdf2_hmac release the GIL, so a thread pool gives
+    real parallelism without the pickling overhead of a process pool.
+    """
+
+    def __init__(
+        self,
+        algorithm: str = PASSWORD_HASH_ALGORITHM,
+        scrypt_n: int = SCRYPT_N,
+        scrypt_r: int = SCRYPT_R,
+        scrypt_p: int = SCRYPT_P,
+        pbkdf2_iterations: int = PBKDF2_ITERATIONS,
+        max_workers: int = PASSWORD_HASH_WORKERS,
+    ):
+        if algorithm not in ("scrypt", "pbkdf2_sha256"):
+            raise ValueError(f"Unsupported password hash algorithm '{algorithm}'")
+        self.algorithm = algorithm
+        self.scrypt_n = scrypt_n
+        self.scrypt_r = scrypt_r
+        self.scrypt_p = scrypt_p
+        self.pbkdf2_iterations = pbkdf2_iterations
+        self.max_workers = max(1, max_workers)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._dummy_hash: Optional[str] = None
+
+    def _scrypt(self, password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+        # hashlib's default maxmem (32 MiB) is below what larger N/r need
+        return hashlib.scrypt(
+            password.encode("utf-8"), salt=salt, n=n, r=r, p=p,
+            maxmem=256 * n * r + 1024 * 1024, dklen=_KEY_BYTES,
+        )
+
+    def _pbkdf2(self, password: str, salt: bytes, iterations: int) -> bytes:
+        return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, iterations, dklen=_KEY_BYTES)
+
+    def hash(self, password: Optional[str]) -> str:
+        """Hash a plain password with a fresh salt and the configured cost"""
+        password = password or ""
+        salt = secrets.token_bytes(_SALT_BYTES)
+        if self.algorithm == "scrypt":
+            key = self._scrypt(password, salt, self.scrypt_n, self.scrypt_r, self.scrypt_p)
+            return f"scrypt${self.scrypt_n}${self.scrypt_r}${self.scrypt_p}${_b64encode(salt)}${_b64encode(key)}"
+        key = self._pbkdf2(password, salt, self.pbkdf2_iterations)
+        return f"pbkdf2_sha256${self.pbkdf2_iterations}${_b64encode(salt)}${_b64encode(key)}"
+
+    def verify(self, plain: Optional[str], hashed: Optional[str]) -> bool:
+        """Check a plain password against any supported stored hash"""
+        plain = plain or ""
+        if not hashed:
+            return False
+        parts = hashed.split("$")
+        try:
+            if parts[0] == "scrypt" and len(parts) == 6:
+                n, r, p = int(parts[1]), int(parts[2]), int(parts[3])
+                expected = _b64decode(parts[5])
+                actual = self._scrypt(plain, _b64decode(parts[4]), n, r, p)
+            elif parts[0] == "pbkdf2_sha256" and len(parts) == 4:
+                expected = _b64decode(parts[3])
+                actual = self._pbkdf2(plain, _b64decode(parts[2]), int(parts[1]))
+            elif len(parts) == 1:
+                return hmac.compare_digest(_legacy_sha256(plain).encode("utf-8"), hashed.encode("utf-8"))
+            else:
+                return False
+        except ValueError:
+            return False
+        return hmac.compare_digest(actual, expected)
+
+    def _get_dummy_hash(self) -> str:
+        # Hash of a random password at the configured cost, made once on first use
+        if self._dummy_hash is None:
+            self._dummy_hash = self.hash(secrets.token_urlsafe(16))
+        return self._dummy_hash
+
+    def warm_up(self) -> None:
+        """Make the dummy hash ahead of the first unknown-email login"""
+        self._get_dummy_hash()
+
+    def verify_or_dummy(self, plain: Optional[str], hashed: Optional[str]) -> bool:
+        """
+        verify(), but always spends one KDF run
+
+        With no stored hash (unknown user) the password is checked against a
+        dummy hash and rejected, so login timing doesn't reveal which emails exist.
+        """
+        if not hashed:
+            self.verify(plain, self._get_dummy_hash())
+            return False
+        return self.verify(plain, hashed)
+
+    def needs_rehash(self, hashed: Optional[str]) -> bool:
+        """True for legacy hashes or hashes made with another algorithm or cost"""
+        if not hashed:
+            return False
+        parts = hashed.split("$")
+        if self.algorithm == "scrypt":
+            return parts[:4] != ["scrypt", str(self.scrypt_n), str(self.scrypt_r), str(self.scrypt_p)]
+        return parts[:2] != ["pbkdf2_sha256", str(self.pbkdf2_iterations)]
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hash")
+        return self._executor
+
+    async def hash_async(self, password: Optional[str]) -> str:
+        """hash() on the hashing pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), self.hash, password)
+
+    async def verify_async(self, plain: Optional[str], hashed: Optional[str]) -> bool:
+        """verify() on the hashing pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), self.verify, plain, hashed)
+
+    async def verify_or_dummy_async(self, plain: Optional[str], hashed: Optional[str]) -> bool:
+        """verify_or_dummy() on the hashing pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), self.verify_or_dummy, plain, hashed)
+
+    def shutdown(self) -> None:
+        """Stop the hashing pool (it is recreated on next use)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher()
+
+
+def hash_password(password: str) -> str:
+    """Return a salted KDF hash for a plain password."""
+    return password_hasher.hash(password)
+
+
 def verify_password(plain: str, hashed: str) -> bool:
-    """Verify a plain password against a sha256 hash."""
-    return hash_password(plain) == (hashed or "")
+    """Verify a plain password against a KDF or legacy sha256 hash."""
+    return password_hasher.verify(plain, hashed)
@@ -0,0 +1,144 @@
+"""
+Precomputed trending rankings over the columnar catalogs
+Keeps the top items per category and answers /trending in O(K)
+"""
+
+import heapq
+import threading
+from itertools import islice
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .catalog import get_catalog
+
+# Deepest ranking kept per category; also the largest ?limit= accepted
+TRENDING_MAX_LIMIT = 100
+
+# (item type, catalog name, baseline rating for catalogs without ratings),
+# in the order ties are broken across categories
+TRENDING_SOURCES = [
+    ("movie", "movies", None),
+    ("book", "books", None),
+    ("blog", "blogs", 3.5),
+    ("product", "products", 4.0),
+]
+
+
+def _top_indices(ratings: np.ndarray, k: int) -> np.ndarray:
+    """
+    Positions of the k highest ratings, best first, ties by position
+
+    Uses argpartition-style selection so only the items at or above the
+    k-th rating are sorted.
+    """
+    n = len(ratings)
+    if n == 0 or k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    if k < n:
+        cutoff = np.partition(ratings, n - k)[n - k]
+        candidates = np.flatnonzero(ratings >= cutoff)
+    else:
+        candidates = np.arange(n)
+    order = np.lexsort((candidates, -ratings[candidates]))
+    return candidates[order][:k]
+
+
+class TrendingService:
+    """Per-category and global top-rated rankings, updated incrementally"""
+
+    def __init__(self, max_limit: int = TRENDING_MAX_LIMIT):
+        self.max_limit = max_limit
+        self._lock = threading.Lock()
+        self._ratings: Dict[str, np.ndarray] = {}
+        self._top: Dict[str, np.ndarray] = {}
+        self._built = False
+
+    def _ensure_built(self) -> None:
+        if self._built:
+            return
+        with self._lock:
+            if self._built:
+                return
+            for kind, name, baseline in TRENDING_SOURCES:
+                self._load_category(kind, name, baseline)
+            self._built = True
+
+    def _load_category(self, kind: str, name: str, baseline: Optional[float]) -> None:
+        catalog = get_catalog(name)
+        if baseline is not None:
+            ratings = np.full(len(catalog), baseline, dtype=np.float64)
+        else:
+            ratings = np.nan_to_num(np.array(catalog.column("rating"), dtype=np.float64), nan=0.0)
+        self._ratings[kind] = ratings
+        self._top[kind] = _top_indices(ratings, self.max_limit)
+
+    def refresh(self, kind: Optional[str] = None) -> None:
+        """
+        Rebuild rankings from the catalogs after items were added or removed
+
+        Args:
+            kind: Item type to rebuild (all when None)
+        """
+        with self._lock:
+            for source_kind, name, baseline in TRENDING_SOURCES:
+                if kind is None or kind == source_kind:
+                    self._load_category(source_kind, name, baseline)
+            self._built = True
+
+    def update_rating(self, kind: str, index: int, rating: float) -> None:
+        """
+        Change one item's rating and re-rank only its category
+
+        The category's top list is recomputed only if the item is in it or
+        now rates at least as high as its last entry.
+
+        Args:
+            kind: Item type ("movie", "book", "blog", "product")
+            index: Item position in its catalog
+            rating: New rating
+        """
+        self._ensure_built()
+        with self._lock:
+            ratings = self._ratings[kind]
+            ratings[index] = rating
+            top = self._top[kind]
+            in_top = bool(np.any(top == index))
+            cutoff = ratings[top[-1]] if len(top) else -np.inf
+            if in_top or len(top) < self.max_limit or rating >= cutoff:
+                self._top[kind] = _top_indices(ratings, self.max_limit)
+
+    def _ranked(self, rank: int, kind: str):
+        ratings = self._ratings[kind]
+        for i in self._top[kind]:
+            yield -float(ratings[i]), rank, int(i), kind
+
+    def _row(self, kind: str, index: int) -> Dict[str, Any]:
+        name = next(n for k, n, _ in TRENDING_SOURCES if k == kind)
+        # Report the ranked rating (baseline or incrementally updated value)
+        return {"type": kind, **get_catalog(name).row(index), "rating": float(self._ratings[kind][index])}
+
+    def top(self, limit: int = 10, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Highest-rated items, best first
+
+        Args:
+            limit: Number of items (capped at max_limit)
+            kind: Restrict to one item type; global ranking when None
+
+        Returns:
+            Item dicts with a "type" field
+        """
+        self._ensure_built()
+        limit = min(limit, self.max_limit)
+        if kind is not None:
+            if kind not in self._top:
+                raise KeyError(kind)
+            return [self._row(kind, int(i)) for i in self._top[kind][:limit]]
+
+        # Global top-K is the top-K of the per-category heads
+        heads = [self._ranked(rank, k) for rank, (k, _, _) in enumerate(TRENDING_SOURCES)]
+        return [self._row(k, i) for _, _, i, k in islice(heapq.merge(*heads), limit)]
+
+
+trending_service = TrendingService()
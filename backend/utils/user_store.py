@@ -0,0 +1,143 @@
+"""
+User repository for auth register/login
+Indexes users by case-folded email so lookups and uniqueness checks are O(1)
+"""
+
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from dotenv import load_dotenv
+
+from data.database import USERS
+
+load_dotenv()
+
+
+class EmailAlreadyRegistered(ValueError):
+    """Raised when registering an email that already has an account"""
+
+
+def email_key(email: str) -> str:
+    """Canonical form used for email uniqueness and lookups"""
+    return (email or "").strip().casefold()
+
+
+class InMemoryUserStore:
+    """Per-process user store: email-key -> user dict plus a monotonic id counter"""
+
+    def __init__(self, seed: Iterable[Dict[str, Any]] = ()):
+        self._lock = threading.Lock()
+        self._by_email: Dict[str, Dict[str, Any]] = {}
+        self._next_id = 1
+        for user in seed:
+            self._by_email[email_key(user["email"])] = dict(user)
+            self._next_id = max(self._next_id, user["id"] + 1)
+
+    def get_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        """Return the user registered with this email, if any"""
+        return self._by_email.get(email_key(email))
+
+    def create(self, name: str, email: str, password_hash: str) -> Dict[str, Any]:
+        """
+        Register a new user
+
+        Raises:
+            EmailAlreadyRegistered: If the email is taken
+        """
+        key = email_key(email)
+        with self._lock:
+            if key in self._by_email:
+                raise EmailAlreadyRegistered(email)
+            user = {"id": self._next_id, "name": name, "email": email, "password": password_hash}
+            self._by_email[key] = user
+            self._next_id += 1
+        return user
+
+    def update_password(self, email: str, password_hash: str) -> None:
+        """Replace a user's stored password hash"""
+        with self._lock:
+            user = self._by_email.get(email_key(email))
+            if user is not None:
+                user["password"] = password_hash
+
+
+class SQLiteUserStore:
+    """
+    User store persisted in SQLite
+
+    The UNIQUE email key and AUTOINCREMENT id make register safe across
+    several uvicorn workers sharing the same database file.
+    """
+
+    def __init__(self, path: str, seed: Iterable[Dict[str, Any]] = ()):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=10.0)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                email TEXT NOT NULL,
+                email_key TEXT NOT NULL UNIQUE,
+                password TEXT
+            )
+            """
+        )
+        for user in seed:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO users (id, name, email, email_key, password) VALUES (?, ?, ?, ?, ?)",
+                (user["id"], user["name"], user["email"], email_key(user["email"]), user.get("password")),
+            )
+
+    @staticmethod
+    def _to_dict(row: Optional[sqlite3.Row]) -> Optional[Dict[str, Any]]:
+        if row is None:
+            return None
+        user = {"id": row["id"], "name": row["name"], "email": row["email"]}
+        if row["password"] is not None:
+            user["password"] = row["password"]
+        return user
+
+    def get_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        """Return the user registered with this email, if any"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, name, email, password FROM users WHERE email_key = ?", (email_key(email),)
+            ).fetchone()
+        return self._to_dict(row)
+
+    def create(self, name: str, email: str, password_hash: str) -> Dict[str, Any]:
+        """
+        Register a new user
+
+        Raises:
+            EmailAlreadyRegistered: If the email is taken
+        """
+        try:
+            with self._lock:
+                cursor = self._conn.execute(
+                    "INSERT INTO users (name, email, email_key, password) VALUES (?, ?, ?, ?)",
+                    (name, email, email_key(email), password_hash),
+                )
+        except sqlite3.IntegrityError:
+            raise EmailAlreadyRegistered(email)
+        return {"id": cursor.lastrowid, "name": name, "email": email, "password": password_hash}
+
+    def update_password(self, email: str, password_hash: str) -> None:
+        """Replace a user's stored password hash"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE users SET password = ? WHERE email_key = ?", (password_hash, email_key(email))
+            )
+
+
+# Set USERS_DB_PATH to persist users in SQLite (shared by all workers)
+USERS_DB_PATH = os.getenv("USERS_DB_PATH")
+
+user_store = SQLiteUserStore(USERS_DB_PATH, seed=USERS) if USERS_DB_PATH else InMemoryUserStore(seed=USERS)